@@ -10,13 +10,18 @@ from textual.widgets import (
     Label,
     Button,
     Input,
+    Checkbox,
 )
 from textual.binding import Binding
 import sqlite3
-# from utils.logger import Logger
+from utils.logger import Logger
+from utils.db_connection import ConnectionFactory
+from utils.async_db import AsyncDatabase
+from utils.query_stats import QueryStats
 
 from views.BuilderView import BuilderView
 from views.DeckView import DeckView
+from views.VirtualCardList import VirtualCardList
 from views.AddToDeckModal import AddToDeckModal
 from views.CreateEmptyDeckModal import CreateEmptyDeckModal
 from utils.card_functions.card_management import CardManagement
@@ -39,10 +44,11 @@ class PokemonTCGApp(App):
 
     def __init__(self):
         super().__init__()
-        self.db_conn = sqlite3.connect("src/db/pokemon_tcg.db")
-        self.db_conn.row_factory = sqlite3.Row
-        self.cursor = self.db_conn.cursor()
-        # self.logger = Logger('log')
+        self.logger = Logger('log')
+        # Slow queries go to the log as they happen, the per-statement summary when the app exits
+        self.query_stats = QueryStats(logger=self.logger.logger)
+        self.db = AsyncDatabase(ConnectionFactory("src/db/pokemon_tcg.db", row_factory=sqlite3.Row,
+                                                  query_stats=self.query_stats))
         self.current_card = ""
         self.current_card_id = 0
         self.current_card_name = ""
@@ -50,7 +56,7 @@ class PokemonTCGApp(App):
         self.current_deck_id = 0
         self.current_deck_name = ""
         self.sort_mode = "name"
-        self.card_management = CardManagement(self.db_conn, self.cursor, self)
+        self.card_management = CardManagement(self.db, self)
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -68,13 +74,14 @@ class PokemonTCGApp(App):
     def action_show_tab(self, tab: str) -> None:
         self.get_child_by_type(TabbedContent).active = tab
 
-    def action_open_actions(self) -> None:
+    async def action_open_actions(self) -> None:
         if not self.current_card:
             self.notify("No card selected", severity="warning")
             return
-        self.push_screen(AddToDeckModal(self.current_card_id, self.current_deck_id, self.db_conn))
+        decks = await self.card_management.load_decks()
+        self.push_screen(AddToDeckModal(self.current_card_id, self.current_deck_id, decks))
 
-    def action_delete_deck(self) -> None:
+    async def action_delete_deck(self) -> None:
         deck_selector = self.query_one("#decks-deck-selector")
         
         highlighted_item = deck_selector.highlighted_child
@@ -89,11 +96,12 @@ class PokemonTCGApp(App):
             self.notify("Could not find ID for the selected deck.", severity="error")
             return
             
-        self.card_management.delete_deck(deck_id_to_delete)
+        await self.card_management.delete_deck(deck_id_to_delete)
         self.card_management.populate_decks_list()
 
-    def action_remove_from_deck(self) -> None:
-        self.card_management.remove_from_deck(self.current_deck_id, self.current_card_id)
+    async def action_remove_from_deck(self) -> None:
+        await self.card_management.remove_from_deck(self.current_deck_id, self.current_card_id)
+        self.card_management.show_deck_cards(self.current_deck_id)
 
     def action_create_empty_deck(self) -> None:
         """Create a new empty deck."""
@@ -135,14 +143,18 @@ class PokemonTCGApp(App):
         
     @on(Input.Changed, '#name-filter')
     def on_name_filter_changed(self, event: Input.Changed) -> None:
-        pass
+        self.card_management.schedule_name_search(event.value)
 
-    @on(ListView.Highlighted, '#builder-cards-list')
-    def builder_cards_list_highlighted(self, event: ListView.Highlighted) -> None:
+    @on(Checkbox.Changed, '#text-search')
+    def on_text_search_changed(self, event: Checkbox.Changed) -> None:
+        self.card_management.set_text_search(event.value)
+
+    @on(VirtualCardList.Highlighted, '#builder-cards-list')
+    def builder_cards_list_highlighted(self, event: VirtualCardList.Highlighted) -> None:
         self.card_management.show_builder_cards_list_info(event)
 
-    @on(ListView.Selected, '#builder-cards-list')
-    def builder_cards_list_selected(self, event: ListView.Selected) -> None:
+    @on(VirtualCardList.Selected, '#builder-cards-list')
+    def builder_cards_list_selected(self, event: VirtualCardList.Selected) -> None:
         self.card_management.show_builder_cards_list_info(event)
 
     @on(ListView.Highlighted, '#decks-deck-selector')
@@ -172,12 +184,12 @@ class PokemonTCGApp(App):
         self.card_management.display_card_details(event)
 
     @on(AddToDeckModal.DeckSelected)
-    def on_deck_selected_from_modal(self, event: AddToDeckModal.DeckSelected) -> None:
-        self.card_management.add_card_to_deck(self.current_card_id, event.deck_id, event.deck_name, self.current_card_name, event.quantity)
+    async def on_deck_selected_from_modal(self, event: AddToDeckModal.DeckSelected) -> None:
+        await self.card_management.add_card_to_deck(self.current_card_id, event.deck_id, event.deck_name, self.current_card_name, event.quantity)
 
     @on(AddToDeckModal.NewDeckCreated)
-    def on_new_deck_created(self, event: AddToDeckModal.NewDeckCreated) -> None:
-        self.card_management.add_card_to_deck(self.current_card_id, event.deck_id, event.deck_name, self.current_card_name, event.quantity)
+    async def on_new_deck_created(self, event: AddToDeckModal.NewDeckCreated) -> None:
+        await self.card_management.add_card_to_deck(self.current_card_id, event.deck_id, event.deck_name, self.current_card_name, event.quantity)
 
         self.query_one("#status-message", Label).update(
             f"Added {event.quantity} copies of {self.current_card_name} to deck: {event.deck_name}"
@@ -185,23 +197,9 @@ class PokemonTCGApp(App):
 
     @on(CreateEmptyDeckModal.DeckCreated)
     def on_deck_created(self, event: CreateEmptyDeckModal.DeckCreated) -> None:
-        # Update the UI
-        self.card_management.populate_decks_list()
-        
-        # Focus on the deck selector
-        decks_list = self.query_one("#decks-deck-selector")
-        decks_list.focus()
-        
-        # Find and select the deck
-        if event.deck_id is not None:
-            for i, item in enumerate(decks_list.children):
-                if getattr(item, "deck_id", None) == event.deck_id:
-                    decks_list.index = i
-                    # Update the cards list for the new deck
-                    self.card_management.populate_decks_cards_list(
-                        ListView.Highlighted(decks_list, item=item)
-                    )
-                    break
+        # Update the UI, moving the highlight onto the new or renamed deck
+        self.card_management.populate_decks_list(select_deck_id=event.deck_id)
+        self.query_one("#decks-deck-selector").focus()
         
         # Update status message
         action = "renamed" if self.is_rename_mode else "created"
@@ -211,6 +209,8 @@ class PokemonTCGApp(App):
 
     def on_mount(self) -> None:
         try:
+            # Queued on the writer thread first, so every later query sees the current schema
+            self.card_management.update_schema()
             self.card_management.populate_set_filter()
             self.card_management.populate_cards_list()
             self.card_management.populate_decks_list()
@@ -226,22 +226,15 @@ class PokemonTCGApp(App):
             
     def set_initial_deck_focus(self) -> None:
         try:
-            decks_list = self.query_one("#decks-deck-selector")
-            decks_list.focus()
-            
-            if len(decks_list.children) > 0:
-                decks_list.index = 0
-                if hasattr(decks_list, "highlighted_child") and decks_list.highlighted_child:
-                    self.notify("Setting initial deck selection")
-                    self.card_management.populate_decks_cards_list(
-                        ListView.Highlighted(decks_list, item=decks_list.highlighted_child)
-                    )
+            # The deck selector highlights its first deck, and loads its cards, once populated
+            self.query_one("#decks-deck-selector").focus()
         except Exception as e:
             self.notify(f"Error in initial deck focus: {str(e)}", severity="error")
 
     def on_unmount(self) -> None:
-        if self.db_conn:
-            self.db_conn.close()
+        if self.db:
+            self.db.close()
+        self.logger.logger.info(f"Query summary\n{self.query_stats.format_summary()}")
 
     def action_export_deck_cards(self) -> None:
         if not self.current_deck_id:
@@ -252,8 +245,7 @@ class PokemonTCGApp(App):
     @on(Input.Changed, "#deck-view-search")
     def on_deck_view_search_changed(self, event: Input.Changed) -> None:
         """Handle deck view search input changes"""
-        search_text = event.value
-        self.card_management.populate_decks_list(search_text)
+        self.card_management.filter_decks_list(event.value)
 
 def main():
     app = PokemonTCGApp()
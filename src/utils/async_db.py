@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from utils.db_connection import ConnectionFactory
+except ImportError:
+    from db_connection import ConnectionFactory
+
+
+class _Interruptible:
+    """Tracks the connection a read is running on so a cancelled caller can interrupt it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self.cancelled = False
+
+    def attach(self, conn) -> bool:
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._conn = conn
+            return True
+
+    def detach(self) -> None:
+        with self._lock:
+            self._conn = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+class AsyncDatabase:
+    """Awaitable access to a ConnectionFactory for code running on the event loop.
+
+    Every call takes a function of (conn, *args) and runs it on a thread, so
+    the loop never waits on SQLite. Reads borrow a pooled reader on the reader
+    threads. Writes, and anything else that needs the writer connection, run
+    one at a time on a single writer thread, in the order they were awaited.
+
+    When the awaiting task is cancelled (a Textual worker replaced by a newer
+    one in the same exclusive group, say) a read still running is interrupted
+    and a read not yet started is skipped; either way its result is dropped.
+    Writes are never interrupted: they finish, and only the result is dropped.
+    """
+
+    def __init__(self, factory: ConnectionFactory):
+        self.factory = factory
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=factory.max_readers, thread_name_prefix="db-reader")
+
+    async def read(self, fn, *args):
+        """Run fn(reader, *args) and return its result"""
+        query = _Interruptible()
+
+        def run():
+            with self.factory.reader() as conn:
+                if not query.attach(conn):
+                    return None
+                try:
+                    return fn(conn, *args)
+                finally:
+                    query.detach()
+
+        future = asyncio.get_running_loop().run_in_executor(self._readers, run)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            query.cancel()
+            raise
+
+    async def write(self, fn, *args):
+        """Run fn(writer, *args) in a transaction, committed on return and rolled back on error"""
+        def run():
+            with self.factory.writer as conn:
+                return fn(conn, *args)
+
+        return await self._on_writer_thread(run)
+
+    async def on_writer(self, fn, *args):
+        """Run fn(writer, *args) outside a transaction, e.g. to build an index or check data_version"""
+        return await self._on_writer_thread(lambda: fn(self.factory.writer, *args))
+
+    async def _on_writer_thread(self, run):
+        future = asyncio.get_running_loop().run_in_executor(self._writer, run)
+        # Cancelling the caller must not cancel a write that is queued but not started
+        return await asyncio.shield(future)
+
+    def close(self) -> None:
+        """Wait for running calls, drop queued reads, then close every connection"""
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True)
+        self.factory.close()
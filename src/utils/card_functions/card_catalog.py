@@ -0,0 +1,99 @@
+import json
+from types import MappingProxyType
+from views.PokemonCard import PokemonCard
+
+CATALOG_COLUMNS = """id, name, set_name, hp, type, image_path, moves, weakness, retreat_cost,
+                    card_type, description, rule_text, set_number"""
+
+
+def decode_json_list(value) -> tuple:
+    """Decode a JSON list column into a tuple, treating empty or malformed text as empty."""
+    if not value:
+        return ()
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        return ()
+    return tuple(decoded) if isinstance(decoded, list) else ()
+
+
+def get_data_version(conn) -> int:
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def get_catalog_version(conn) -> int:
+    """The counter that importers bump whenever they change the cards"""
+    row = conn.execute("SELECT version FROM catalog_version WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+class CardCatalog:
+    """Read-only snapshot of the cards table with the JSON columns already decoded.
+
+    Records are PokemonCard instances keyed by card id. The snapshot is never
+    mutated; CardManagement swaps in a new one when the catalog version changes.
+    The data version, which any commit from another connection moves (a deck
+    edit too), only says when the catalog version is worth reading again.
+    """
+
+    def __init__(self, cards, data_version: int, version: int = 0):
+        self._cards = MappingProxyType(cards)
+        self.data_version = data_version
+        self.version = version
+        self.display_order = tuple(
+            sorted(cards.values(), key=lambda card: (card.set_name, card.name, card.id))
+        )
+        self.set_names = tuple(sorted({card.set_name for card in cards.values()}))
+
+    @classmethod
+    def load(cls, conn) -> "CardCatalog":
+        data_version = get_data_version(conn)
+        version = get_catalog_version(conn)
+        rows = conn.execute(f"SELECT {CATALOG_COLUMNS} FROM cards").fetchall()
+        cards = {}
+        for row in rows:
+            cards[row[0]] = PokemonCard(
+                row[0],
+                row[1],
+                row[2],
+                row[3],
+                row[4],
+                row[5],
+                decode_json_list(row[6]),
+                decode_json_list(row[7]),
+                decode_json_list(row[8]),
+                row[9] or "",
+                row[10] or "",
+                row[11] or "",
+                row[12] or "",
+            )
+        return cls(cards, data_version, version)
+
+    def current_data_version(self, conn, checked_data_version=None):
+        """Return the data version at which this snapshot is still current, or None if the cards changed.
+
+        checked_data_version is the data version the caller last got back
+        (this snapshot's own by default); while it has not moved, the catalog
+        version is not read. Keeping the returned value is up to the caller.
+        """
+        if checked_data_version is None:
+            checked_data_version = self.data_version
+        data_version = get_data_version(conn)
+        if data_version == checked_data_version:
+            return data_version
+        # Something other than the cards may have changed, a deck edit say
+        if get_catalog_version(conn) == self.version:
+            return data_version
+        return None
+
+    def get(self, card_id):
+        return self._cards.get(card_id)
+
+    def __getitem__(self, card_id):
+        return self._cards[card_id]
+
+    def __contains__(self, card_id) -> bool:
+        return card_id in self._cards
+
+    def __len__(self) -> int:
+        return len(self._cards)
@@ -1,224 +1,507 @@
+import asyncio
+import json
 import sqlite3
 import os
-from textual.widgets import Static, ListView, ListItem, Label, Select
+import re
+from functools import lru_cache, partial
+from rich.text import Text
+from textual.widgets import Static, Label, Select, Checkbox, Input
+from textual.css.query import NoMatches
+from textual.worker import get_current_worker
 from time import time_ns
 from views.PokemonCard import *
-import json
+from views.VirtualCardList import VirtualCardList
+from views.KeyedListView import KeyedListView
+from utils.card_functions.card_catalog import CardCatalog
+from utils.card_functions.card_matrix import CardMatrix
+from utils.card_functions.name_index import CardNameIndex, card_label
+from utils.import_cards import (
+    ensure_search_index,
+    ensure_database_schema,
+    energy_type_code,
+    CATEGORY_POKEMON,
+    TRAINER_CATEGORIES,
+)
+
+NAME_SEARCH_DEBOUNCE = 0.1
+DECK_SIZE = 20
+# Copies of one card name allowed in a deck, whichever sets they come from
+MAX_COPIES_PER_NAME = 2
+# What edit_deck can do to a card's count
+DECK_EDIT_ACTIONS = ("add", "remove", "set")
+CARD_DETAILS_CACHE_SIZE = 256
+# Filter results kept per catalog version, oldest dropped first
+FILTER_CACHE_SIZE = 64
+# Filters only the CardMatrix column store answers; with any of them set it answers all of them
+MATRIX_FILTERS = ("min_hp", "max_hp", "weakness")
+# Seconds the cursor must rest on a card before its neighbours' images are prefetched
+IMAGE_PREFETCH_DELAY = 0.2
+
+# bm25 column weights for cards_fts (name, attacks, effect)
+TEXT_SEARCH_WEIGHTS = (10.0, 4.0, 2.0)
+
+def fts_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last as a prefix."""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def card_filter_query(filters: dict):
+    """Return (sql, params) selecting the ids of cards that pass the set, category, type,
+    attack and retreat filters.
+
+    Set, category and type are equality or IN tests on indexed columns, the
+    latter two on the integer codes written at import time, so each
+    combination is answered from a covering index (see check_query_plans.py).
+    Returns (None, []) when no filter narrows the catalog.
+    """
+    clauses = []
+    params = []
+
+    if filters.get("set"):
+        clauses.append("set_name = ?")
+        params.append(filters["set"])
+
+    category = filters.get("category")
+    pokemon_type = filters.get("pokemon_type")
+    if category == "pokemon":
+        clauses.append("category_code = ?")
+        params.append(CATEGORY_POKEMON)
+    elif category == "trainer":
+        clauses.append(f"category_code IN ({', '.join('?' * len(TRAINER_CATEGORIES))})")
+        params.extend(TRAINER_CATEGORIES)
+
+    if category in ("pokemon", "all") and pokemon_type and pokemon_type != "all":
+        clauses.append("type_code = ?")
+        params.append(energy_type_code(pokemon_type))
+
+    # An attack must satisfy both the cost and the damage limits on its own
+    move_clauses = []
+    if filters.get("max_attack_cost") is not None:
+        move_clauses.append("energy_count <= ?")
+        params.append(filters["max_attack_cost"])
+    if filters.get("min_damage") is not None:
+        move_clauses.append("damage >= ?")
+        params.append(filters["min_damage"])
+    if move_clauses:
+        clauses.append(f"id IN (SELECT card_id FROM moves WHERE {' AND '.join(move_clauses)})")
+
+    if filters.get("max_retreat") is not None:
+        clauses.append("retreat_count <= ?")
+        params.append(filters["max_retreat"])
+
+    if not clauses:
+        return None, []
+    return "SELECT id FROM cards WHERE " + " AND ".join(clauses), params
 
 class CardManagement:
-    def __init__(self, db, cursor, app):
-        self.db_conn = db
-        self.cursor = cursor
+    def __init__(self, db, app):
+        """db is the app's AsyncDatabase. Lookups that refresh a widget run in exclusive
+        workers, so a newer request for the same widget cancels the one in flight and
+        its result is never shown; deck edits are awaited by the handlers in main.py.
+        The schema is brought up to date by update_schema(), off the UI thread."""
+        self.db = db
         self.app = app
+        self.schema_update = None
         self.current_filters = {
             "set": "",
             "name": "",
             "category": "all",
-            "pokemon_type": "all"
+            "pokemon_type": "all",
+            "max_attack_cost": None,
+            "min_damage": None,
+            "max_retreat": None,
+            "min_hp": None,
+            "max_hp": None,
+            "weakness": "all",
+            "text_search": False
         }
-
-    def add_card_to_deck(self, card_id, deck_id, deck_name, card_name, quantity=1) -> None:
-        try:
-            self.cursor.execute("SELECT SUM(count) FROM deck_cards WHERE deck_id = ?", (deck_id,))
-            total_cards = self.cursor.fetchone()[0] or 0
-            if total_cards + quantity > 20:
-                self.app.notify(f"Deck '{deck_name}' would exceed 20 cards. Cannot add {quantity} copies of {card_name}.", severity="warning")
-                return
-
-            self.cursor.execute("SELECT count FROM deck_cards WHERE deck_id = ? AND card_id = ?", (deck_id, card_id))
-            card_count_row = self.cursor.fetchone()
-            card_count = card_count_row[0] if card_count_row else 0
-            if card_count + quantity > 2:
-                self.app.notify(f"Deck '{deck_name}' would exceed 2 copies of {card_name}. Cannot add {quantity} more.", severity="warning")
-                return
-
-            self.cursor.execute("""
+        self.base_card_ids = None
+        self.filter_cache = {}
+        self.card_matrix = None
+        self.catalog = None
+        self.catalog_data_version = None
+        self.catalog_lock = asyncio.Lock()
+        self.name_index = None
+        self.name_search_timer = None
+        self.name_search_generation = 0
+        self.search_index_ready = False
+        self.render_card_details = lru_cache(maxsize=CARD_DETAILS_CACHE_SIZE)(self._render_card_details)
+        self.prefetch_timer = None
+        self.decks = None
+        self.deck_search_text = ""
+
+    def update_schema(self) -> None:
+        """Apply pending schema migrations on the writer thread; the app calls this first on mount.
+
+        Writes queue behind it on the same thread. Reads run on reader threads,
+        so each worker that can start with one awaits schema_ready() first.
+        """
+        if self.schema_update is None:
+            self.schema_update = asyncio.ensure_future(self.db.on_writer(ensure_database_schema))
+
+    async def schema_ready(self) -> None:
+        self.update_schema()
+        # Shielded, so a cancelled worker does not cancel the migration for the others
+        await asyncio.shield(self.schema_update)
+
+    async def edit_deck(self, deck_id, deck_name, edits) -> bool:
+        """Apply (action, card_id, quantity) edits to one deck in a single transaction.
+
+        action is "add", "remove" or "set". The edits are folded into new counts
+        and checked against the deck limits as a whole, so nothing is written if
+        any limit would be broken. Only the edited cards' rows are read or written.
+        Copies of a card that is no longer in the catalog can be removed but not
+        added. Returns whether the edits were applied.
+        """
+        edits = list(edits)
+        unknown = [action for action, _, _ in edits if action not in DECK_EDIT_ACTIONS]
+        if unknown:
+            self.app.notify(f"Unknown deck edit: {unknown[0]}", severity="error")
+            return False
+        card_ids = json.dumps(sorted({card_id for _, card_id, _ in edits}))
+
+        def apply(conn):
+            current = dict(conn.execute("""
+                SELECT card_id, count FROM deck_cards
+                WHERE deck_id = ? AND card_id IN (SELECT value FROM json_each(?))
+            """, (deck_id, card_ids)).fetchall())
+            names = dict(conn.execute(
+                "SELECT id, name FROM cards WHERE id IN (SELECT value FROM json_each(?))", (card_ids,)
+            ).fetchall())
+
+            counts = dict(current)
+            for action, card_id, quantity in edits:
+                count = counts.get(card_id, 0)
+                if action == "add":
+                    count += quantity
+                elif action == "remove":
+                    count -= quantity
+                else:
+                    count = quantity
+                counts[card_id] = max(count, 0)
+
+            changes = {card_id: count - current.get(card_id, 0) for card_id, count in counts.items()}
+            changes = {card_id: change for card_id, change in changes.items() if change}
+            if not changes:
+                return None
+            for card_id, change in changes.items():
+                if change > 0 and card_id not in names:
+                    return f"Card {card_id} is not in the catalog."
+
+            # Limits are only enforced on growth, so an oversized deck can still be trimmed
+            added = sum(changes.values())
+            total_row = conn.execute("SELECT total FROM deck_totals WHERE deck_id = ?", (deck_id,)).fetchone()
+            if added > 0 and (total_row[0] if total_row else 0) + added > DECK_SIZE:
+                return f"Deck '{deck_name}' would exceed {DECK_SIZE} cards."
+
+            # Reprints share a name, so copies from every set count together
+            name_changes = {}
+            for card_id, change in changes.items():
+                # Counted under '', as the deck_cards triggers do for a card gone from the catalog
+                name = names.get(card_id, "")
+                name_changes[name] = name_changes.get(name, 0) + change
+            name_counts = dict(conn.execute("""
+                SELECT card_name, count FROM deck_name_counts
+                WHERE deck_id = ? AND card_name IN (SELECT value FROM json_each(?))
+            """, (deck_id, json.dumps(list(name_changes)))).fetchall())
+            for name, change in name_changes.items():
+                if change > 0 and name_counts.get(name, 0) + change > MAX_COPIES_PER_NAME:
+                    return f"Deck '{deck_name}' would exceed {MAX_COPIES_PER_NAME} copies of {name}."
+
+            conn.executemany("""
                 INSERT INTO deck_cards (deck_id, card_id, count)
                 VALUES (?, ?, ?)
-                ON CONFLICT (deck_id, card_id) DO UPDATE SET count = count + ?
-            """, (deck_id, card_id, quantity, quantity))
-            self.db_conn.commit()
-            self.app.notify(f"Added {quantity} copies of {card_name} to {deck_name}")
+                ON CONFLICT (deck_id, card_id) DO UPDATE SET count = excluded.count
+            """, [(deck_id, card_id, counts[card_id]) for card_id in changes if counts[card_id] > 0])
+            conn.executemany(
+                "DELETE FROM deck_cards WHERE deck_id = ? AND card_id = ?",
+                [(deck_id, card_id) for card_id in changes if counts[card_id] == 0]
+            )
+            return None
 
+        try:
+            problem = await self.db.write(apply)
         except sqlite3.Error as e:
-            error_msg = f"Error adding card to deck: {str(e)}"
+            error_msg = f"Error editing deck: {str(e)}"
             self.app.query_one("#status-message", Label).update(error_msg)
             self.app.notify(f"Database error: {str(e)}", severity="error")
-            self.db_conn.rollback()
+            return False
 
-    def remove_from_deck(self, deck_id, card_id) -> None:
-        self.cursor.execute("BEGIN TRANSACTION;")
-        self.cursor.execute(f"UPDATE deck_cards SET count = CASE WHEN count > 1 THEN count - 1 ELSE 0 END WHERE deck_id = {(deck_id)} AND card_id = {(card_id)};")
-        self.cursor.execute("DELETE FROM deck_cards WHERE count = 0;")
-        self.db_conn.commit()
+        if problem:
+            self.app.notify(problem, severity="warning")
+            return False
+        return True
+
+    async def add_card_to_deck(self, card_id, deck_id, deck_name, card_name, quantity=1) -> bool:
+        if not await self.edit_deck(deck_id, deck_name, [("add", card_id, quantity)]):
+            return False
+        self.app.notify(f"Added {quantity} copies of {card_name} to {deck_name}")
+        return True
+
+    async def remove_from_deck(self, deck_id, card_id) -> bool:
+        return await self.edit_deck(deck_id, None, [("remove", card_id, 1)])
+
+    async def delete_deck(self, deck_id) -> None:
+        def delete(conn):
+            conn.execute("DELETE FROM deck_cards WHERE deck_id = ?", (deck_id,))
+            conn.execute("DELETE FROM decks WHERE id = ?", (deck_id,))
 
-    def delete_deck(self, deck_id) -> None:
         try:
-            self.db_conn.execute("BEGIN TRANSACTION")
-            self.cursor.execute("DELETE FROM deck_cards WHERE deck_id = ?", (deck_id,))
-            self.cursor.execute("DELETE FROM decks WHERE id = ?", (deck_id,))
-            self.db_conn.commit()
+            await self.db.write(delete)
             self.app.notify(f"Deleted deck {deck_id}", severity="information")
 
         except sqlite3.Error as e:
             error_msg = f"Error deleting deck: {str(e)}"
             self.app.notify(f"{error_msg}", severity="error")
-            self.db_conn.rollback()
 
-    def rename_deck(self, deck_id, new_name) -> None:
-        try:
-            self.cursor.execute("""
+    async def rename_deck(self, deck_id, new_name) -> None:
+        def rename(conn):
+            conn.execute("""
                 UPDATE decks 
                 SET name = ?
                 WHERE id = ?
             """, (new_name, deck_id))
-            self.db_conn.commit()
+
+        try:
+            await self.db.write(rename)
             self.app.notify(f"Renamed deck to {new_name}", severity="information")
             
         except sqlite3.Error as e:
             error_msg = f"Error renaming deck: {str(e)}"
             self.app.notify(error_msg, severity="error")
-            self.db_conn.rollback()
 
-    def create_empty_deck(self, deck_name) -> None:
-        try:
-            # Start transaction
-            self.db_conn.execute("BEGIN TRANSACTION")
-            
-            # Insert new deck
-            self.cursor.execute("""
+    async def create_empty_deck(self, deck_name):
+        """Insert a deck and return its id, or None when the insert failed."""
+        def create(conn):
+            return conn.execute("""
                 INSERT INTO decks (name)
                 VALUES (?)
-            """, (deck_name,))
-            
-            # Get the ID of the newly created deck
-            self.cursor.execute("SELECT last_insert_rowid()")
-            new_deck_id = self.cursor.fetchone()[0]
-            
-            # Commit transaction
-            self.db_conn.commit()
-            
-            return new_deck_id
+            """, (deck_name,)).lastrowid
+
+        try:
+            return await self.db.write(create)
             
         except sqlite3.Error as e:
             error_msg = f"Error creating deck: {str(e)}"
             self.app.notify(error_msg, severity="error")
-            self.db_conn.rollback()
             return None
 
-    def populate_decks_list(self, search_text: str = "") -> None:
+    async def load_decks(self) -> list:
+        await self.schema_ready()
+        self.decks = await self.db.read(
+            lambda conn: conn.execute("SELECT id, name FROM decks ORDER BY name").fetchall()
+        )
+        return self.decks
+
+    def populate_decks_list(self, search_text=None, select_deck_id=None) -> None:
+        """Reload the decks from the database and reconcile the deck selector with them."""
+        if search_text is not None:
+            self.deck_search_text = search_text
+        self.app.run_worker(partial(self._populate_decks_list, select_deck_id), group="decks", exclusive=True)
+
+    async def _populate_decks_list(self, select_deck_id) -> None:
         try:
-            decks_list = self.app.query_one("#decks-deck-selector")
-            deck_cards = self.app.query_one("#decks-cards-list")
-            
-            decks_list.clear()
-            deck_cards.clear()
-
-            # Get all decks with optional search filter
-            query = "SELECT decks.id, decks.name FROM decks"
-            params = []
-            if search_text:
-                query += " WHERE name LIKE ?"
-                params.append(f"%{search_text}%")
-            query += " ORDER BY name"
-            
-            decks = self.cursor.execute(query, params).fetchall()
-
-            for deck in decks:
-                unique_id = f"deck-{deck[0]}-{time_ns()}"
-                deck_name = str(deck[1])
-                item = ListItem(
-                    Static(deck_name),
-                    id=unique_id,
-                )
-                setattr(item, "deck_id", deck[0])
-                decks_list.append(item)
-            
-            if decks:
-                decks_list.index = 0
-            else:
-                decks_list.index = None
+            await self.load_decks()
+            self.show_decks(select_deck_id)
 
         except Exception as e:
             self.app.notify(f"Error populating decks: {str(e)}", severity="error")
             raise
 
+    def filter_decks_list(self, search_text: str) -> None:
+        """Filter the already loaded decks by name without going back to the database."""
+        self.deck_search_text = search_text
+        if self.decks is None:
+            self.populate_decks_list()
+        else:
+            self.show_decks()
+
+    def show_decks(self, select_deck_id=None) -> None:
+        decks_list = self.app.query_one("#decks-deck-selector", KeyedListView)
+        search_text = self.deck_search_text.casefold()
+        rows = [
+            (deck_id, str(deck_name))
+            for deck_id, deck_name in self.decks
+            if search_text in str(deck_name).casefold()
+        ]
+        decks_list.reconcile(rows, select_key=select_deck_id)
+        # An emptied selector highlights nothing, so nothing will refresh the deck's cards
+        if not rows:
+            self.show_deck_cards(None)
+
     def populate_cards_list(self, filters=None) -> None:
+        if filters:
+            for key in filters:
+                if hasattr(filters[key], "__class__") and filters[key].__class__.__name__ == "NoSelection":
+                    filters[key] = "" 
+            self.current_filters = filters
+        self.app.run_worker(partial(self._populate_cards_list, dict(self.current_filters)), group="cards", exclusive=True)
+
+    async def _populate_cards_list(self, filters) -> None:
         try:
-            cards_list = self.app.query_one("#builder-cards-list")
-            cards_list.clear()
-
-            if filters:
-                for key in filters:
-                    if hasattr(filters[key], "__class__") and filters[key].__class__.__name__ == "NoSelection":
-                        filters[key] = "" 
-                self.current_filters = filters
-            
-            query = """SELECT
-                        id, name, set_name, image_path, type, card_type
-                    FROM
-                        cards
-                    WHERE 1=1
-                    """
-            params = []
-            
-            if self.current_filters.get("set") and self.current_filters["set"] != "":
-                query += " AND set_name = ?"
-                params.append(self.current_filters["set"])
-            
-            if self.current_filters.get("name"):
-                query += " AND name LIKE ?"
-                params.append(f"%{self.current_filters['name']}%")
-            
-            if self.current_filters.get("category") == "pokemon":
-                query += " AND (card_type IS NULL OR card_type = '')"
-                if self.current_filters.get("pokemon_type") and self.current_filters["pokemon_type"] != "all":
-                    query += " AND type LIKE ?"
-                    params.append(f"%{self.current_filters['pokemon_type']}%")
-            elif self.current_filters.get("category") == "trainer":
-                query += " AND (card_type = 'Trainer' OR card_type = 'Supporter')"
-            
-            elif self.current_filters.get("category") == "all" and \
-                 self.current_filters.get("pokemon_type") and \
-                 self.current_filters["pokemon_type"] != "all":
-                query += " AND type LIKE ?"
-                params.append(f"%{self.current_filters['pokemon_type']}%")
-            
-            query += " ORDER BY set_name, name"
-            
-            cards = self.cursor.execute(query, params).fetchall()
-            
-            for card in cards:
-                unique_id = f"card-{card[0]}-{time_ns()}"
-                display_text = f"{card[1]} ({card[2]})"
-                item = ListItem(
-                    Static(display_text),
-                    id=unique_id,
-                )
-                setattr(item, "card_id", card[0])
-                cards_list.append(item)
-                
-            if cards:
-                cards_list.index = 0
+            await self.refresh_catalog()
+
+            # The name filter is answered by the in-memory name index, so SQL
+            # only narrows by the remaining filters (and is skipped without any).
+            query, params = card_filter_query(filters)
+            if any(filters.get(key) not in (None, "", "all") for key in MATRIX_FILTERS):
+                matrix = await self.get_card_matrix()
+                self.base_card_ids = frozenset(matrix.card_ids(filters).tolist())
+            elif query:
+                # The statement and its parameters are the normalised filter
+                key = (query, tuple(params))
+                # A catalog swapped in meanwhile gets a new cache, so this result cannot leak into it
+                cache = self.filter_cache
+                card_ids = cache.get(key)
+                if card_ids is None:
+                    cards = await self.db.read(lambda conn: conn.execute(query, params).fetchall())
+                    card_ids = frozenset(card[0] for card in cards)
+                    if len(cache) >= FILTER_CACHE_SIZE:
+                        del cache[next(iter(cache))]
+                    cache[key] = card_ids
+                self.base_card_ids = card_ids
             else:
-                cards_list.index = None
-            
-            self.app.query_one("#status-message", Label).update(
-                f"Found {len(cards)} cards matching your filters"
-            )
+                self.base_card_ids = None
+
+            self.show_name_matches()
 
         except Exception as e:
             self.app.notify(f"Error populating card list: {str(e)}", severity="error")
             raise
-            
+
+    async def get_card_matrix(self) -> CardMatrix:
+        """The column store of the current catalog, built on first use."""
+        if self.card_matrix is None:
+            self.card_matrix = await self.db.on_writer(CardMatrix.load)
+        return self.card_matrix
+
+    def get_catalog(self):
+        """The loaded card catalog, or None until refresh_catalog() has first completed."""
+        return self.catalog
+
+    async def refresh_catalog(self) -> CardCatalog:
+        """Load the card catalog, or reload it if an importer has bumped the catalog version."""
+        await self.schema_ready()
+        async with self.catalog_lock:
+            if self.catalog is not None:
+                data_version = await self.db.on_writer(
+                    self.catalog.current_data_version, self.catalog_data_version
+                )
+                if data_version is not None:
+                    # Skips the catalog version lookup until the next commit
+                    self.catalog_data_version = data_version
+                    return self.catalog
+            # Swapped in whole, so handlers running meanwhile keep using the old one
+            catalog = await self.db.on_writer(CardCatalog.load)
+            self.catalog = catalog
+            self.catalog_data_version = catalog.data_version
+            self.name_index = None
+            self.filter_cache = {}
+            self.card_matrix = None
+            self.search_index_ready = False
+            self.render_card_details.cache_clear()
+            return catalog
+
+    def get_name_index(self, catalog: CardCatalog) -> CardNameIndex:
+        if self.name_index is None:
+            self.name_index = CardNameIndex(
+                (card.id, card.name, card.set_name, card.set_number) for card in catalog.display_order
+            )
+        return self.name_index
+
+    def show_name_matches(self) -> None:
+        """Fill the Builder card list from the name index and the current base filters."""
+        # Snapshots, so filters changed while the worker waits apply only to the next one
+        self.app.run_worker(partial(self._show_name_matches, dict(self.current_filters), self.base_card_ids),
+                            group="name-matches", exclusive=True)
+
+    async def _show_name_matches(self, filters, base_card_ids) -> None:
+        catalog = self.catalog or await self.refresh_catalog()
+        name_index = self.get_name_index(catalog)
+        card_ids = name_index.card_ids
+        labels = name_index.labels
+
+        name = filters.get("name", "")
+        if filters.get("text_search") and name.strip():
+            ordinals = [name_index.ordinals[card_id] for card_id in await self.search_card_text(name, base_card_ids)
+                        if card_id in name_index.ordinals]
+        else:
+            ordinals = name_index.search(name)
+
+        if base_card_ids is None:
+            rows = [(card_ids[o], labels[o]) for o in ordinals]
+        else:
+            rows = [(card_ids[o], labels[o]) for o in ordinals if card_ids[o] in base_card_ids]
+
+        cards_list = self.app.query_one("#builder-cards-list", VirtualCardList)
+        cards_list.set_rows(rows)
+        self.app.query_one("#status-message", Label).update(
+            f"Found {len(rows)} cards matching your filters"
+        )
+
+    async def search_card_text(self, text: str, card_ids=None, limit: int = 500) -> list:
+        """Return ids of cards whose name, attacks or effect text match, best match first.
+
+        Only cards in card_ids are returned, if given, so the limit applies to
+        the cards the other filters leave rather than to every match.
+        """
+        match = fts_match_query(text)
+        if not match:
+            return []
+        if not self.search_index_ready:
+            await self.db.on_writer(ensure_search_index)
+            self.search_index_ready = True
+        allowed = None if card_ids is None else json.dumps(list(card_ids))
+        rows = await self.db.read(lambda conn: conn.execute("""SELECT
+                        rowid
+                    FROM
+                        cards_fts
+                    WHERE
+                        cards_fts MATCH ?
+                        AND (? IS NULL OR rowid IN (SELECT value FROM json_each(?)))
+                    ORDER BY
+                        bm25(cards_fts, ?, ?, ?)
+                    LIMIT ?
+                    """, (match, allowed, allowed, *TEXT_SEARCH_WEIGHTS, limit)).fetchall())
+        return [row[0] for row in rows]
+
+    def schedule_name_search(self, name: str) -> None:
+        """Debounce name filter keystrokes; only the latest pending search runs."""
+        self.name_search_generation += 1
+        generation = self.name_search_generation
+        if self.name_search_timer is not None:
+            self.name_search_timer.stop()
+        self.name_search_timer = self.app.set_timer(
+            NAME_SEARCH_DEBOUNCE, lambda: self.run_name_search(name, generation)
+        )
+
+    def set_text_search(self, enabled: bool) -> None:
+        self.current_filters["text_search"] = enabled
+        self.show_name_matches()
+
+    def run_name_search(self, name: str, generation: int) -> None:
+        if generation != self.name_search_generation:
+            return
+        self.name_search_timer = None
+        try:
+            self.current_filters["name"] = name
+            self.show_name_matches()
+        except Exception as e:
+            self.app.notify(f"Error searching cards: {str(e)}", severity="error")
+
     def populate_set_filter(self) -> None:
+        self.app.run_worker(self._populate_set_filter, group="set-filter", exclusive=True)
+
+    async def _populate_set_filter(self) -> None:
         try:
             set_filter = self.app.query_one("#set-filter", Select)
             
-            query = "SELECT DISTINCT set_name FROM cards ORDER BY set_name"
-            sets = self.cursor.execute(query).fetchall()
-            
-            options = [(set_name[0], set_name[0]) for set_name in sets]
+            catalog = await self.refresh_catalog()
+            options = [(set_name, set_name) for set_name in catalog.set_names]
             
             all_option = ("", "All Sets")
             options.insert(0, all_option)
@@ -254,12 +537,22 @@ class CardManagement:
                 type_value = "all"  
             elif type_filter.value not in (None, ""):
                 type_value = type_filter.value
+
+            weakness_filter = self.app.query_one("#weakness-filter", Select)
+            weakness_value = weakness_filter.value if isinstance(weakness_filter.value, str) else "all"
             
             filters = {
                 "set": set_value,
                 "name": name_filter.value,
                 "category": category_value,
-                "pokemon_type": type_value
+                "pokemon_type": type_value,
+                "max_attack_cost": self.number_filter_value("#attack-cost-filter"),
+                "min_damage": self.number_filter_value("#damage-filter"),
+                "max_retreat": self.number_filter_value("#retreat-filter"),
+                "min_hp": self.number_filter_value("#min-hp-filter"),
+                "max_hp": self.number_filter_value("#max-hp-filter"),
+                "weakness": weakness_value,
+                "text_search": self.app.query_one("#text-search", Checkbox).value
             }
             
             self.populate_cards_list(filters)
@@ -268,6 +561,11 @@ class CardManagement:
             self.app.notify(f"Error applying filters: {str(e)}", severity="error")
             raise
             
+    def number_filter_value(self, selector: str):
+        """Return the whole number typed into a filter input, or None when it is blank or invalid."""
+        value = self.app.query_one(selector, Input).value.strip()
+        return int(value) if value.isdigit() else None
+
     def clear_filters(self) -> None:
         try:
             set_filter = self.app.query_one("#set-filter", Select)
@@ -275,6 +573,11 @@ class CardManagement:
             
             self.app.query_one("#name-filter").value = ""
             self.app.query_one("#category-all").value = True
+            self.app.query_one("#text-search", Checkbox).value = False
+            for selector in ("#attack-cost-filter", "#damage-filter", "#retreat-filter",
+                             "#min-hp-filter", "#max-hp-filter"):
+                self.app.query_one(selector, Input).value = ""
+            self.app.query_one("#weakness-filter", Select).value = "all"
             
             try:
                 type_filter.value = "all" 
@@ -289,7 +592,14 @@ class CardManagement:
                 "set": "",
                 "name": "",
                 "category": "all",
-                "pokemon_type": "all"
+                "pokemon_type": "all",
+                "max_attack_cost": None,
+                "min_damage": None,
+                "max_retreat": None,
+                "min_hp": None,
+                "max_hp": None,
+                "weakness": "all",
+                "text_search": False
             }
             self.populate_cards_list()
             
@@ -298,45 +608,43 @@ class CardManagement:
             raise
 
     def populate_decks_cards_list(self, event) -> None:
+        deck_id = getattr(event.item, "deck_id", None)
+        if deck_id is not None:
+            self.app.current_deck_id = deck_id
+        self.show_deck_cards(deck_id)
+
+    def show_deck_cards(self, deck_id) -> None:
+        """Reconcile the deck card list with the cards of deck_id, or empty it when there is none."""
+        self.app.run_worker(partial(self._show_deck_cards, deck_id), group="deck-cards", exclusive=True)
+
+    async def _show_deck_cards(self, deck_id) -> None:
         try:
-            decks_cards_list = self.app.query_one("#decks-cards-list", ListView)
-            decks_cards_list.clear()
-            
-            deck_id = getattr(event.item, "deck_id", None)
+            decks_cards_list = self.app.query_one("#decks-cards-list", KeyedListView)
 
             if deck_id is None:
+                decks_cards_list.reconcile([])
                 return
 
-            self.app.current_deck_id = deck_id
-            
-            cursor = self.db_conn.cursor()
             query = """SELECT
-                        d.name AS deck_name,
                         c.id AS card_id,
                         c.name AS card_name,
                         c.set_name AS set_name,
+                        c.set_number AS set_number,
                         dc.count
                     FROM
                         deck_cards dc
-                    JOIN
-                        decks d ON dc.deck_id = d.id
                     JOIN
                         cards c ON dc.card_id = c.id
                     WHERE
                         dc.deck_id = ?;
                     """
 
-            cards = cursor.execute(query, (deck_id,)).fetchall()
-
-            for card in cards:
-                unique_id = f"decks-card-{card[1]}-{time_ns()}"
-                card_display = f"{card[2]} ({card[3]}) (x{card[4]})"
-                item = ListItem(
-                    Static(card_display),
-                    id=unique_id,
-                )
-                setattr(item, "card_id", card[1])
-                decks_cards_list.append(item)
+            await self.schema_ready()
+            cards = await self.db.read(lambda conn: conn.execute(query, (deck_id,)).fetchall())
+            decks_cards_list.reconcile(
+                (card_id, f"{card_label(card_name, set_name, set_number)} (x{count})")
+                for card_id, card_name, set_name, set_number, count in cards
+            )
 
         except Exception as e:
             self.app.notify(f"Error loading deck cards: {str(e)}", severity="error")
@@ -383,198 +691,150 @@ class CardManagement:
             return f"{base_path}/{type_map[type_name]}"
         return ""
 
+    def _render_card_details(self, card_id):
+        card = self.get_catalog().get(card_id)
+        if card is None:
+            return None
+
+        string = (
+            f"Name: {card.name}\n"
+            f"Set: {card.set_name}\n"
+        )
+        
+        if card.card_type:
+            string += f"Card Type: {card.card_type}\n"
+        
+        if not card.card_type or ("Pokémon" in card.card_type and "Tool" not in card.card_type):
+            moves_display = ""
+            for move in card.moves:
+                energy_cost = ", ".join(move.get("energy_cost", []))
+                move_name = move.get("name", "")
+                damage = move.get("damage", "")
+                move_description = move.get("description", "")
+                moves_display += f"{move_name} ({energy_cost}) - {damage} - {move_description}\n"
+            
+            retreat_cost_display = "None"
+            if card.retreat_cost:
+                # Display retreat cost as number and type
+                retreat_cost_display = f"{len(card.retreat_cost)} {card.retreat_cost[0]}"
+            
+            string += (
+                f"HP: {card.hp}\n"
+                f"Type: {card.type}\n"
+                f"Moves:\n{moves_display}\n"
+                f"Weakness: {', '.join(card.weakness) if card.weakness else 'None'}\n"
+                f"Retreat Cost: {retreat_cost_display}\n"
+            )
+        elif "Trainer" in card.card_type or "Tool" in card.card_type or "Supporter" in card.card_type:
+            if card.description:
+                string += f"\nEffect:\n{card.description}\n"
+            if card.rule_text:
+                string += f"\nRule Text:\n{card.rule_text}\n"
+
+        return Text(string)
+
+    def show_card_details(self, card_id, stats_selector: str, image_selector: str, neighbour_ids=()) -> None:
+        """Show a card's stats and image in one of the detail panes."""
+        catalog = self.get_catalog()
+        card = catalog.get(card_id) if catalog is not None else None
+        if card is None:
+            return
+
+        self.app.current_card = card
+        self.app.current_card_id = card.id
+        self.app.current_card_name = card.name
+
+        card_image = self.app.query_one(image_selector, CardImage)
+        card_image.update_image(self.ensure_image_path_exists(card.image_path))
+
+        self.app.query_one(stats_selector, Static).update(self.render_card_details(card_id))
+        self.app.query_one("#status-message", Label).update(f"Selected: {card_label(card.name, card.set_name, card.set_number)} - Press 'o' for actions")
+        self.schedule_image_prefetch(neighbour_ids, image_selector)
+
+    def schedule_image_prefetch(self, card_ids, image_selector: str) -> None:
+        """Once the cursor settles, render the neighbouring cards' images in the background."""
+        if self.prefetch_timer is not None:
+            self.prefetch_timer.stop()
+        self.prefetch_timer = self.app.set_timer(
+            IMAGE_PREFETCH_DELAY, lambda: self.prefetch_images(card_ids, image_selector)
+        )
+
+    def prefetch_images(self, card_ids, image_selector: str) -> None:
+        self.prefetch_timer = None
+        catalog = self.get_catalog()
+        if catalog is None:
+            return
+        try:
+            card_image = self.app.query_one(image_selector, CardImage)
+        except NoMatches:
+            # The pane is gone, e.g. the app is shutting down
+            return
+        target_size = card_image.target_size()
+        image_paths = [
+            self.ensure_image_path_exists(catalog[card_id].image_path)
+            for card_id in card_ids if card_id in catalog
+        ]
+        if not image_paths:
+            return
+
+        def prefetch() -> None:
+            worker = get_current_worker()
+            card_image.prefetch(image_paths, target_size, lambda: worker.is_cancelled)
+
+        self.app.run_worker(prefetch, thread=True, group="image-prefetch", exclusive=True)
+
     def display_card_details(self, event) -> None:
         try:
             card_id = getattr(event.item, "card_id", None)
             if card_id is None:
                 return
-            
-            query = """SELECT
-                        id, name, set_name, hp, type, image_path, moves, weakness, retreat_cost,
-                        card_type, description, rule_text
-                    FROM
-                        cards
-                    WHERE
-                        id = ?;
-                    """
-            card = self.cursor.execute(query, (card_id,)).fetchone()
-
-            if card:
-                self.app.current_card = PokemonCard(*card)
-                self.app.current_card_id = card[0]
-                self.app.current_card_name = card[1]
-                
-                image_path = self.ensure_image_path_exists(card[5])
-                
-                card_image = self.app.query_one("#card-image-decks-view", CardImage)
-                card_image.update_image(image_path)
-
-                moves = json.loads(card[6]) if card[6] else []
-                weakness = json.loads(card[7]) if card[7] else []
-                retreat_cost = json.loads(card[8]) if card[8] else []
-                
-                # Convert retreat_cost array to image paths
-                retreat_cost_images = []
-                for cost_type in retreat_cost:
-                    image_path = CardManagement.get_type_image_path(cost_type)
-                    if image_path:
-                        retreat_cost_images.append(image_path)
-                
-                card_type = card[9] if len(card) > 9 and card[9] else ""
-                description = card[10] if len(card) > 10 and card[10] else ""
-                rule_text = card[11] if len(card) > 11 and card[11] else ""
-
-                string = ""
-                
-                string = (
-                    f"Name: {card[1]}\n"
-                    f"Set: {card[2]}\n"
-                )
-                
-                if card_type:
-                    string += f"Card Type: {card_type}\n"
-                
-                if not card_type or ("Pokémon" in card_type and "Tool" not in card_type):
-                    moves_display = ""
-                    for move in moves:
-                        energy_cost = ", ".join(move.get("energy_cost", []))
-                        move_name = move.get("name", "")
-                        damage = move.get("damage", "")
-                        move_description = move.get("description", "")
-                        moves_display += f"{move_name} ({energy_cost}) - {damage} - {move_description}\n"
-                    
-                    # Create retreat cost display using actual values instead of image paths
-                    retreat_cost_display = "None"
-                    if retreat_cost:
-                        # Display retreat cost as number and type
-                        retreat_count = len(retreat_cost)
-                        retreat_type = retreat_cost[0] if retreat_cost else "Colorless"
-                        retreat_cost_display = f"{retreat_count} {retreat_type}"
-                    
-                    string += (
-                        f"HP: {card[3]}\n"
-                        f"Type: {card[4]}\n"
-                        f"Moves:\n{moves_display}\n"
-                        f"Weakness: {', '.join(weakness) if weakness else 'None'}\n"
-                        f"Retreat Cost: {retreat_cost_display}\n"
-                    )
-                elif "Trainer" in card_type or "Tool" in card_type or "Supporter" in card_type:
-                    if description:
-                        string += f"\nEffect:\n{description}\n"
-                    if rule_text:
-                        string += f"\nRule Text:\n{rule_text}\n"
-
-                stats = self.app.query_one("#decks-card-stats", Static)
-                stats.update(string)
-                self.app.query_one("#status-message", Label).update(f"Selected: {self.app.current_card_name} ({card[2]}) - Press 'o' for actions")
+            cards_list = event.list_view
+            index = cards_list.index or 0
+            neighbour_ids = [
+                getattr(cards_list.children[i], "card_id", None)
+                for i in (index - 1, index + 1) if 0 <= i < len(cards_list.children)
+            ]
+            self.show_card_details(card_id, "#decks-card-stats", "#card-image-decks-view", neighbour_ids)
         except Exception as e:
             self.app.notify(f"Error displaying card: {str(e)}", severity="error")
             raise
 
     def show_builder_cards_list_info(self, event) -> None:
         try:
-            card_id = getattr(event.item, "card_id", None)
+            card_id = getattr(event, "card_id", None)
             if card_id is None:
                 return
-
-            query = """SELECT
-                        id, name, set_name, hp, type, image_path, moves, weakness, retreat_cost,
-                        card_type, description, rule_text
-                    FROM
-                        cards
-                    WHERE
-                        id = ?;
-                    """
-            card = self.cursor.execute(query, (card_id,)).fetchone()
-
-            if card:
-                self.app.current_card = PokemonCard(*card)
-                self.app.current_card_id = card[0]
-                self.app.current_card_name = card[1]
-                
-                image_path = self.ensure_image_path_exists(card[5])
-                
-                card_image = self.app.query_one("#card-image-builder-view", CardImage)
-                card_image.update_image(image_path)
-
-                moves = json.loads(card[6]) if card[6] else []
-                weakness = json.loads(card[7]) if card[7] else []
-                retreat_cost = json.loads(card[8]) if card[8] else []
-                
-                card_type = card[9] if len(card) > 9 and card[9] else ""
-                description = card[10] if len(card) > 10 and card[10] else ""
-                rule_text = card[11] if len(card) > 11 and card[11] else ""
-
-                string = ""
-                
-                string = (
-                    f"Name: {card[1]}\n"
-                    f"Set: {card[2]}\n"
-                )
-                
-                if card_type:
-                    string += f"Card Type: {card_type}\n"
-                
-                if not card_type or "Pokémon" in card_type and not "Tool" in card_type:
-                    moves_display = ""
-                    for move in moves:
-                        energy_cost = ", ".join(move.get("energy_cost", []))
-                        move_name = move.get("name", "")
-                        damage = move.get("damage", "")
-                        move_description = move.get("description", "")
-                        moves_display += f"{move_name} ({energy_cost}) - {damage} - {move_description}\n"
-                    
-                    # Convert retreat_cost array to image paths
-                    retreat_cost_images = []
-                    for cost_type in retreat_cost:
-                        image_path = CardManagement.get_type_image_path(cost_type)
-                        if image_path:
-                            retreat_cost_images.append(image_path)
-                    
-                    # Create retreat cost display using actual values instead of image paths
-                    retreat_cost_display = "None"
-                    if retreat_cost:
-                        # Display retreat cost as number and type
-                        retreat_count = len(retreat_cost)
-                        retreat_type = retreat_cost[0] if retreat_cost else "Colorless"
-                        retreat_cost_display = f"{retreat_count} {retreat_type}"
-                    
-                    string += (
-                        f"HP: {card[3]}\n"
-                        f"Type: {card[4]}\n"
-                        f"Moves:\n{moves_display}\n"
-                        f"Weakness: {', '.join(weakness) if weakness else 'None'}\n"
-                        f"Retreat Cost: {retreat_cost_display}\n"
-                    )
-                elif "Trainer" in card_type or "Tool" in card_type or "Supporter" in card_type:
-                    if description:
-                        string += f"\nEffect:\n{description}\n"
-                    if rule_text:
-                        string += f"\nRule Text:\n{rule_text}\n"
-
-                stats = self.app.query_one("#builder-card-stats", Static)
-                stats.update(string)
-                self.app.query_one("#status-message", Label).update(f"Selected: {self.app.current_card_name} ({card[2]}) - Press 'o' for actions")
-
+            cards_list = self.app.query_one("#builder-cards-list", VirtualCardList)
+            index = cards_list.index_of(card_id)
+            neighbour_ids = [] if index is None else [
+                cards_list.card_id_at(index - 1), cards_list.card_id_at(index + 1)
+            ]
+            self.show_card_details(card_id, "#builder-card-stats", "#card-image-builder-view", neighbour_ids)
         except Exception as e:
             self.app.notify(f"Error displaying card: {str(e)}", severity="error")
             raise
 
     def export_deck_cards(self, deck_id) -> None:
-        try:
+        self.app.run_worker(partial(self._export_deck_cards, deck_id), group="export")
+
+    async def _export_deck_cards(self, deck_id) -> None:
+        def read_deck(conn):
             # Get deck name
-            self.cursor.execute("SELECT name FROM decks WHERE id = ?", (deck_id,))
-            deck_name = self.cursor.fetchone()[0]
-            
+            deck_name = conn.execute("SELECT name FROM decks WHERE id = ?", (deck_id,)).fetchone()[0]
+
             # Get all cards in the deck
-            self.cursor.execute("""
+            cards = conn.execute("""
                 SELECT c.name, c.set_name, dc.count
                 FROM deck_cards dc
                 JOIN cards c ON dc.card_id = c.id
                 WHERE dc.deck_id = ?
                 ORDER BY c.name
-            """, (deck_id,))
-            cards = self.cursor.fetchall()
+            """, (deck_id,)).fetchall()
+            return deck_name, cards
+
+        try:
+            await self.schema_ready()
+            deck_name, cards = await self.db.read(read_deck)
             
             if not cards:
                 self.app.notify("No cards in deck to export", severity="warning")
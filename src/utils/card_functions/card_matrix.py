@@ -0,0 +1,134 @@
+import numpy as np
+
+from utils.import_cards import energy_type_code, CATEGORY_POKEMON, TRAINER_CATEGORIES
+
+# Value stored for a card without HP, below any real HP
+NO_HP = -1
+# Damage stored for an attack that does no damage (NULL in moves.damage)
+NO_DAMAGE = -1
+# Best damage stored for a cost no attack of the card fits in
+NO_ATTACK = -2
+
+
+class CardMatrix:
+    """The filterable card attributes as NumPy columns, one row per card.
+
+    Built once per catalog version. A filter is a chain of vectorized
+    comparisons producing a boolean mask over the rows, so no SQL or per-card
+    Python runs however many cards there are. As in card_filter_query, one
+    attack must meet both the cost and damage limits: row k of best_damage
+    holds each card's highest damage among attacks costing at most k energy,
+    so the pair of limits is a single comparison. An attack without damage
+    fits a cost limit but, as damage >= ? is false for NULL, no damage limit.
+    """
+
+    def __init__(self, ids, set_codes, set_names, category_codes, type_codes, hp, retreat,
+                 weakness, move_rows, move_costs, move_damage):
+        self.ids = ids
+        self.set_codes = set_codes
+        self.set_index = {name: code for code, name in enumerate(set_names)}
+        self.category_codes = category_codes
+        self.is_trainer = np.isin(category_codes, TRAINER_CATEGORIES)
+        self.type_codes = type_codes
+        self.hp = hp
+        self.retreat = retreat
+        # Bit n is set when the card is weak to the energy type with code n
+        self.weakness = weakness
+
+        max_cost = int(move_costs.max()) if len(move_costs) else 0
+        best_damage = np.full((max_cost + 1, len(ids)), NO_ATTACK, dtype=np.int32)
+        for cost in range(max_cost + 1):
+            fits = move_costs <= cost
+            np.maximum.at(best_damage[cost], move_rows[fits], move_damage[fits])
+        self.best_damage = best_damage
+
+    @classmethod
+    def load(cls, conn) -> "CardMatrix":
+        cards = conn.execute(
+            "SELECT id, set_name, category_code, type_code, hp, retreat_count FROM cards ORDER BY id"
+        ).fetchall()
+        ids = np.fromiter((row[0] for row in cards), dtype=np.int64, count=len(cards))
+        set_names = sorted({row[1] for row in cards})
+        set_index = {name: code for code, name in enumerate(set_names)}
+        row_of = {card_id: row for row, card_id in enumerate(ids.tolist())}
+
+        weakness = np.zeros(len(cards), dtype=np.uint16)
+        for card_id, energy_type in conn.execute("SELECT card_id, energy_type FROM card_weakness"):
+            if card_id in row_of:
+                weakness[row_of[card_id]] |= 1 << energy_type_code(energy_type)
+
+        moves = [
+            (row_of[card_id], energy_count, damage)
+            for card_id, energy_count, damage in conn.execute(
+                "SELECT card_id, energy_count, coalesce(damage, ?) FROM moves", (NO_DAMAGE,)
+            )
+            if card_id in row_of
+        ]
+        move_columns = np.array(moves, dtype=np.int32).reshape(-1, 3)
+
+        return cls(
+            ids,
+            np.array([set_index[row[1]] for row in cards], dtype=np.int32),
+            set_names,
+            np.array([row[2] for row in cards], dtype=np.int8),
+            np.array([row[3] for row in cards], dtype=np.int8),
+            np.array([NO_HP if row[4] is None else row[4] for row in cards], dtype=np.int32),
+            np.array([row[5] or 0 for row in cards], dtype=np.int16),
+            weakness,
+            move_columns[:, 0],
+            move_columns[:, 1],
+            move_columns[:, 2],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, filters: dict) -> np.ndarray:
+        """Return the boolean mask of rows passing every filter; names and unset filters are ignored"""
+        mask = np.ones(len(self.ids), dtype=bool)
+
+        if filters.get("set"):
+            set_code = self.set_index.get(filters["set"])
+            if set_code is None:
+                return np.zeros(len(self.ids), dtype=bool)
+            mask &= self.set_codes == set_code
+
+        category = filters.get("category")
+        if category == "pokemon":
+            mask &= self.category_codes == CATEGORY_POKEMON
+        elif category == "trainer":
+            mask &= self.is_trainer
+
+        pokemon_type = filters.get("pokemon_type")
+        if category in ("pokemon", "all") and pokemon_type and pokemon_type != "all":
+            mask &= self.type_codes == energy_type_code(pokemon_type)
+
+        if filters.get("min_hp") is not None:
+            mask &= self.hp >= filters["min_hp"]
+        if filters.get("max_hp") is not None:
+            mask &= (self.hp <= filters["max_hp"]) & (self.hp != NO_HP)
+
+        weakness = filters.get("weakness")
+        if weakness and weakness != "all":
+            mask &= (self.weakness & (1 << energy_type_code(weakness))) != 0
+
+        if filters.get("max_retreat") is not None:
+            mask &= self.retreat <= filters["max_retreat"]
+
+        max_cost = filters.get("max_attack_cost")
+        min_damage = filters.get("min_damage")
+        if max_cost is not None or min_damage is not None:
+            if max_cost is None:
+                max_cost = len(self.best_damage) - 1
+            elif max_cost < 0:
+                return np.zeros(len(self.ids), dtype=bool)
+            best_damage = self.best_damage[min(max_cost, len(self.best_damage) - 1)]
+            if min_damage is None:
+                mask &= best_damage != NO_ATTACK
+            else:
+                mask &= best_damage >= max(min_damage, 0)
+
+        return mask
+
+    def card_ids(self, filters: dict) -> np.ndarray:
+        return self.ids[self.mask(filters)]
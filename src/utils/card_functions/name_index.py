@@ -0,0 +1,75 @@
+import re
+from array import array
+from collections import defaultdict
+
+
+def card_label(name, set_name, set_number) -> str:
+    """How a card is listed: its name, set and, to tell printings of a name apart, its number in the set"""
+    match = re.search(r"\d+/\d+", set_number or "")
+    if match:
+        return f"{name} ({set_name} {match.group()})"
+    return f"{name} ({set_name})"
+
+
+class CardNameIndex:
+    """In-memory substring index over card names.
+
+    Cards are stored in display order (set, then name) and every 1-, 2- and
+    3-character slice of a lowercased name maps to the ascending ordinals of
+    the cards containing it. A query walks the shortest posting list and only
+    verifies those candidates, so lookups scale with the number of matches
+    rather than with the size of the catalog.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self, rows):
+        """Build the index from (card_id, name, set_name, set_number) rows in display order."""
+        self.card_ids = []
+        self.labels = []
+        self.names = []
+        self.ordinals = {}
+        postings = defaultdict(lambda: array("I"))
+
+        for ordinal, (card_id, name, set_name, set_number) in enumerate(rows):
+            name = name or ""
+            folded = name.casefold()
+            self.card_ids.append(card_id)
+            self.labels.append(card_label(name, set_name, set_number))
+            self.names.append(folded)
+            self.ordinals[card_id] = ordinal
+            for gram in self._grams(folded):
+                postings[gram].append(ordinal)
+
+        self.postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.card_ids)
+
+    @classmethod
+    def _grams(cls, text):
+        grams = set()
+        for size in range(1, cls.GRAM_SIZE + 1):
+            for start in range(len(text) - size + 1):
+                grams.add(text[start:start + size])
+        return grams
+
+    def search(self, text):
+        """Return the ordinals of cards whose name contains text, in display order."""
+        query = (text or "").casefold()
+        if not query:
+            return range(len(self.card_ids))
+
+        if len(query) <= self.GRAM_SIZE:
+            return self.postings.get(query, ())
+
+        shortest = None
+        for start in range(len(query) - self.GRAM_SIZE + 1):
+            posting = self.postings.get(query[start:start + self.GRAM_SIZE])
+            if not posting:
+                return ()
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+
+        names = self.names
+        return [ordinal for ordinal in shortest if query in names[ordinal]]
@@ -0,0 +1,82 @@
+import gzip
+import json
+from itertools import islice
+
+# Suffixes of newline-delimited JSON files, one card object per line
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+# Cards read and written per batch by the streaming importer
+RECORD_BATCH_SIZE = 1000
+
+
+def is_ndjson(path: str) -> bool:
+    """Whether path names an NDJSON file, gzip-compressed or not"""
+    path = str(path)
+    if path.endswith(".gz"):
+        path = path[:-3]
+    return path.endswith(NDJSON_SUFFIXES)
+
+
+def open_records(path: str, mode: str = "r"):
+    """Open a card file as text, through gzip when its name ends in .gz"""
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_card_records(path: str):
+    """Yield the cards of a file one at a time.
+
+    NDJSON is read a line at a time, so memory stays flat however large the
+    file is. A JSON array, the format the scrapers have always written, has to
+    be parsed whole.
+    """
+    with open_records(path) as f:
+        if not is_ndjson(path):
+            yield from json.load(f)
+            return
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from None
+
+
+def read_card_batches(paths, batch_size: int = RECORD_BATCH_SIZE):
+    """Yield lists of at most batch_size cards, read in turn from every path"""
+    for path in paths:
+        records = read_card_records(path)
+        while batch := list(islice(records, batch_size)):
+            yield batch
+
+
+class CardRecordWriter:
+    """Appends cards to an NDJSON file as they are scraped.
+
+    A .gz path is compressed. An uncompressed file is flushed after every
+    card, so cards written before a scrape fails are kept and the file can be
+    imported while the scrape is still running.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self.count = 0
+        self._flush = not self.path.endswith(".gz")
+        self._file = open_records(self.path, "w")
+
+    def write(self, card: dict) -> None:
+        self._file.write(json.dumps(card, ensure_ascii=False) + "\n")
+        if self._flush:
+            self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
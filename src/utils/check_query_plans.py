@@ -0,0 +1,170 @@
+import argparse
+import ast
+import itertools
+import sqlite3
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SRC_DIR))
+
+from utils.card_functions.card_management import card_filter_query
+from utils.db_connection import connect
+from utils.import_cards import ensure_database_schema, ensure_search_index
+
+CARD_MANAGEMENT_PATH = SRC_DIR / "utils" / "card_functions" / "card_management.py"
+# Statements that start with these are planned; BEGIN, PRAGMA and the like are not
+PLANNED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+# Every combination of Builder filters that card_filter_query can be asked for
+FILTER_VALUES = {
+    "set": ("", "geneticapex"),
+    "category": ("all", "pokemon", "trainer"),
+    "pokemon_type": ("all", "fire"),
+    "max_attack_cost": (None, 2),
+    "min_damage": (None, 60),
+    "max_retreat": (None, 1),
+}
+
+
+def own_nodes(function):
+    """Walk a function's body without descending into the functions defined inside it"""
+    pending = list(ast.iter_child_nodes(function))
+    while pending:
+        node = pending.pop()
+        yield node
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            pending.extend(ast.iter_child_nodes(node))
+
+
+def collect_statements(path: Path):
+    """Return (statements, problems) for every execute() call in a module.
+
+    Statements are (location, sql) pairs for SQL passed as a literal or through
+    a local variable assigned a literal, each attributed to the innermost
+    function (queries run through AsyncDatabase sit in nested functions; a
+    lambda counts as part of the function it is in). SQL built by
+    card_filter_query is checked separately; any other SQL that cannot be read statically (an
+    f-string, a variable from elsewhere) is reported as a problem so that new
+    queries cannot slip past the check.
+    """
+    tree = ast.parse(path.read_text(), filename=str(path))
+    statements = []
+    problems = []
+
+    for function in ast.walk(tree):
+        if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        assignments = {}
+        for node in own_nodes(function):
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    names = target.elts if isinstance(target, ast.Tuple) else [target]
+                    for name in names:
+                        if isinstance(name, ast.Name):
+                            assignments.setdefault(name.id, []).append(node.value)
+
+        for node in own_nodes(function):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in ("execute", "executemany") and node.args):
+                continue
+            location = f"{function.name}:{node.lineno}"
+            sql = node.args[0]
+            values = assignments.get(sql.id, []) if isinstance(sql, ast.Name) else [sql]
+            if not values:
+                problems.append(f"{location}: SQL in '{ast.unparse(sql)}' cannot be checked")
+            for value in values:
+                if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    statements.append((location, value.value))
+                elif (isinstance(value, ast.Call) and isinstance(value.func, ast.Name)
+                      and value.func.id == "card_filter_query"):
+                    continue
+                else:
+                    problems.append(f"{location}: SQL built from '{ast.unparse(value)[:60]}' cannot be checked")
+
+    return statements, problems
+
+
+def filter_statements():
+    statements = []
+    for values in itertools.product(*FILTER_VALUES.values()):
+        filters = dict(zip(FILTER_VALUES, values))
+        sql, params = card_filter_query(filters)
+        if sql:
+            statements.append((f"card_filter_query {filters}", sql))
+    return statements
+
+
+def plan_problems(conn: sqlite3.Connection, sql: str):
+    """Return the query plan lines of sql and whatever in them counts as a regression.
+
+    A statement with a WHERE clause must search an index. A full read (no WHERE)
+    may only walk a covering index. A sort needing a temporary b-tree is only
+    accepted for joins and full-text queries, whose order no index can supply.
+    """
+    params = [None] * sql.count("?")
+    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    words = sql.upper().split()
+    full_read = "WHERE" not in words
+    virtual = any("VIRTUAL TABLE" in line for line in plan)
+
+    problems = []
+    for line in plan:
+        if line.startswith("SCAN ") and "VIRTUAL TABLE" not in line and line != "SCAN CONSTANT ROW":
+            if not (full_read and "COVERING INDEX" in line):
+                problems.append(line)
+        elif line.startswith("USE TEMP B-TREE") and "JOIN" not in words and not virtual:
+            problems.append(line)
+    return plan, problems
+
+
+def check_query_plans(db_path: str, verbose: bool = False) -> int:
+    """Plan every CardManagement statement against a copy of db_path; return the number of failures"""
+    source = connect(db_path, read_only=True)
+    conn = sqlite3.connect(":memory:")
+    source.backup(conn)
+    source.close()
+    ensure_database_schema(conn)
+    ensure_search_index(conn)
+
+    statements, failures = collect_statements(CARD_MANAGEMENT_PATH)
+    for failure in failures:
+        print(f"FAIL {failure}")
+
+    for location, sql in statements + filter_statements():
+        if not sql.strip().upper().startswith(PLANNED_STATEMENTS):
+            continue
+        try:
+            plan, problems = plan_problems(conn, sql)
+        except sqlite3.Error as e:
+            plan, problems = [], [f"cannot be planned: {e}"]
+        if problems:
+            failures.append(location)
+            print(f"FAIL {location}: {'; '.join(problems)}")
+            print(f"     {' '.join(sql.split())}")
+        elif verbose:
+            print(f"ok   {location}: {'; '.join(plan) or 'no table access'}")
+
+    conn.close()
+    print(f"Checked {len(statements)} statements and {len(filter_statements())} filter combinations, "
+          f"{len(failures)} failed")
+    return len(failures)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Check that no CardManagement query plans a full table scan')
+    parser.add_argument('--db', type=str, default=None,
+                       help='Database file path (default: db/pokemon_tcg.db in the project root)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Print the plan of every statement, not just the failures')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    db_path = args.db if args.db else SRC_DIR / 'db' / 'pokemon_tcg.db'
+    sys.exit(1 if check_query_plans(str(db_path), args.verbose) else 0)
+
+
+if __name__ == "__main__":
+    main()
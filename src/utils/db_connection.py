@@ -0,0 +1,113 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    from utils.query_stats import InstrumentedConnection
+except ImportError:
+    from query_stats import InstrumentedConnection
+
+DEFAULT_DB_PATH = "src/db/pokemon_tcg.db"
+# Milliseconds a connection waits for another's lock before "database is locked"
+BUSY_TIMEOUT_MS = 5000
+# Page cache per connection, in KiB
+CACHE_SIZE_KIB = 16 * 1024
+# Bytes of the database file each connection may memory-map
+MMAP_SIZE = 256 * 1024 * 1024
+# Read-only connections the factory keeps open for queries
+READER_POOL_SIZE = 3
+
+
+def configure_connection(conn: sqlite3.Connection, read_only: bool = False) -> sqlite3.Connection:
+    """Apply the shared pragmas; writers also switch the file to WAL, which persists in it"""
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    if not read_only:
+        conn.execute("PRAGMA journal_mode = WAL")
+        # Safe under WAL: a power loss can only drop the last commits, never corrupt
+        conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def connect(db_path=DEFAULT_DB_PATH, read_only: bool = False,
+            check_same_thread: bool = True, query_stats=None) -> sqlite3.Connection:
+    """Open db_path with the shared pragmas, read-only if asked.
+
+    Given a QueryStats, every statement run on the connection is recorded in it.
+    """
+    factory = sqlite3.Connection if query_stats is None else InstrumentedConnection
+    if read_only:
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True,
+                               timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=check_same_thread,
+                               factory=factory)
+    else:
+        conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_MS / 1000,
+                               check_same_thread=check_same_thread, factory=factory)
+    if query_stats is not None:
+        conn.query_stats = query_stats
+    return configure_connection(conn, read_only)
+
+
+class ConnectionFactory:
+    """The connections one process uses on a database: a single writer and a reader pool.
+
+    With WAL, readers never wait for the writer (or for another process, such
+    as an import, writing the same file) and see everything committed before
+    their query started. Every change goes through the one writer connection.
+    Connections are not tied to the thread that opened them, but each must
+    only be used by one thread at a time.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, readers: int = READER_POOL_SIZE, row_factory=None,
+                 query_stats=None):
+        self.db_path = db_path
+        self.row_factory = row_factory
+        self.query_stats = query_stats
+        self.max_readers = readers
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._lock = threading.Lock()
+        # Opened first so the file is already in WAL mode when readers attach
+        self.writer = self._open(read_only=False)
+
+    def _open(self, read_only: bool) -> sqlite3.Connection:
+        conn = connect(self.db_path, read_only=read_only, check_same_thread=False,
+                       query_stats=self.query_stats)
+        if self.row_factory is not None:
+            conn.row_factory = self.row_factory
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection, waiting for one if the whole pool is in use"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._reader_count < self.max_readers
+                if can_open:
+                    self._reader_count += 1
+            if not can_open:
+                conn = self._readers.get()
+            else:
+                try:
+                    conn = self._open(read_only=True)
+                except sqlite3.Error:
+                    with self._lock:
+                        self._reader_count -= 1
+                    raise
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        self.writer.close()
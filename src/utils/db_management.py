@@ -3,12 +3,21 @@ import sqlite3
 from pathlib import Path
 import glob
 
+try:
+    from utils.db_connection import connect
+    from utils.import_cards import bump_catalog_version, ensure_database_schema
+except ImportError:
+    from db_connection import connect
+    from import_cards import bump_catalog_version, ensure_database_schema
+
 class DBManagement:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, query_stats=None):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = connect(db_path, query_stats=query_stats)
         self.cursor = self.conn.cursor()
         self.conn.row_factory = sqlite3.Row
+        # Creates the catalog version counter this tool bumps
+        ensure_database_schema(self.conn)
 
     def update_card_image_paths(self):
         """Updates the image_path column in cards table with paths to card images"""
@@ -170,5 +179,7 @@ class DBManagement:
                 updated_count += 1
                 print(f"Updated image for {name} ({set_name}): {image_path}")
         
+        if updated_count > 0:
+            bump_catalog_version(self.cursor)
         self.conn.commit()
         return updated_count
\ No newline at end of file
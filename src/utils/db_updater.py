@@ -1,5 +1,8 @@
 from db_management import DBManagement
+from query_stats import QueryStats
 
-db_management = DBManagement("src/db/pokemon_tcg.db")
+query_stats = QueryStats()
+db_management = DBManagement("src/db/pokemon_tcg.db", query_stats)
 
-db_management.update_card_image_paths()
\ No newline at end of file
+db_management.update_card_image_paths()
+print(query_stats.format_summary())
@@ -1,121 +1,1008 @@
 import json
+import logging
+import multiprocessing
 import sqlite3
 import os
+import re
 import argparse
+from collections import Counter
+import glob
+from queue import Empty
+import hashlib
 from pathlib import Path
 import sys
+from time import perf_counter
 
-def import_cards_from_json(json_file: str, db_path: str, force_recreate: bool = False) -> None:
-    """Import Pokemon cards from a JSON file to a SQLite database"""
+try:
+    from utils.db_connection import connect
+    from utils.query_stats import QueryStats
+    from utils.card_records import RECORD_BATCH_SIZE, read_card_batches
+except ImportError:
+    from db_connection import connect
+    from query_stats import QueryStats
+    from card_records import RECORD_BATCH_SIZE, read_card_batches
+
+SEARCH_INDEX_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+    name, attacks, effect,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+# Energy types in code order: a card's type_code is its position here plus one,
+# and 0 means it has no (or an unrecognised) type
+ENERGY_TYPES = ("grass", "fire", "water", "electric", "psychic", "fighting",
+                "darkness", "metal", "dragon", "colorless")
+# Other spellings of an energy type seen across sets and in the UI
+ENERGY_TYPE_ALIASES = {"dark": "darkness", "lightning": "electric", "steel": "metal", "normal": "colorless"}
+
+# category_code values, derived from the scraped card_type text
+CATEGORY_UNKNOWN = 0
+CATEGORY_POKEMON = 1
+CATEGORY_ITEM = 2
+CATEGORY_SUPPORTER = 3
+CATEGORY_TOOL = 4
+CATEGORY_ENERGY = 5
+TRAINER_CATEGORIES = (CATEGORY_ITEM, CATEGORY_SUPPORTER, CATEGORY_TOOL)
+
+# A card is identified by its set and its number in that set; alternate and full
+# art printings share a name but not a number
+CARD_KEY_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS idx_cards_set_number ON cards(set_name, set_number)"
+
+# (table, index name, statement) for the indexes behind the Builder filters
+# (set, category, Pokemon type) and the deck selector. Filters select only the
+# card id, which is the rowid, so each of these indexes covers them.
+CARD_INDEXES = (
+    ("cards", "idx_cards_set_codes", "CREATE INDEX IF NOT EXISTS idx_cards_set_codes ON cards(set_name, category_code, type_code)"),
+    ("cards", "idx_cards_category_code", "CREATE INDEX IF NOT EXISTS idx_cards_category_code ON cards(category_code, type_code, set_name)"),
+    ("cards", "idx_cards_type_code", "CREATE INDEX IF NOT EXISTS idx_cards_type_code ON cards(type_code, set_name)"),
+    ("decks", "idx_decks_name", "CREATE INDEX IF NOT EXISTS idx_decks_name ON decks(name)"),
+    ("cards", "idx_cards_retreat", "CREATE INDEX IF NOT EXISTS idx_cards_retreat ON cards(retreat_count)"),
+    ("moves", "idx_moves_cost_damage", "CREATE INDEX IF NOT EXISTS idx_moves_cost_damage ON moves(energy_count, damage, card_id)"),
+    ("moves", "idx_moves_damage", "CREATE INDEX IF NOT EXISTS idx_moves_damage ON moves(damage, card_id)"),
+    ("moves", "idx_moves_card", "CREATE INDEX IF NOT EXISTS idx_moves_card ON moves(card_id)"),
+    ("move_costs", "idx_move_costs_type", "CREATE INDEX IF NOT EXISTS idx_move_costs_type ON move_costs(energy_type, count, move_id)"),
+    ("card_weakness", "idx_card_weakness_type", "CREATE INDEX IF NOT EXISTS idx_card_weakness_type ON card_weakness(energy_type, card_id)"),
+)
+
+# Attacks, their energy costs and card weaknesses as rows, so they can be
+# filtered in SQL; the JSON columns on cards stay the source for display.
+CARD_DETAIL_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS moves (
+        id INTEGER PRIMARY KEY,
+        card_id INTEGER NOT NULL REFERENCES cards (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        description TEXT,
+        damage INTEGER,
+        damage_text TEXT,
+        energy_count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS move_costs (
+        move_id INTEGER NOT NULL REFERENCES moves (id) ON DELETE CASCADE,
+        energy_type TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (move_id, energy_type)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS card_weakness (
+        card_id INTEGER NOT NULL REFERENCES cards (id) ON DELETE CASCADE,
+        energy_type TEXT NOT NULL,
+        damage INTEGER,
+        PRIMARY KEY (card_id, energy_type)
+    ) WITHOUT ROWID
+    """,
+)
+
+# Running totals per deck: its card count and the copies of each card name,
+# which counts reprints from different sets together. Triggers on deck_cards
+# keep them current, so the deck limits are checked with two key lookups.
+DECK_AGGREGATE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS decks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deck_cards (
+        deck_id INTEGER,
+        card_id INTEGER,
+        count INTEGER DEFAULT 1,
+        FOREIGN KEY (deck_id) REFERENCES decks (id),
+        FOREIGN KEY (card_id) REFERENCES cards (id),
+        PRIMARY KEY (deck_id, card_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deck_totals (
+        deck_id INTEGER PRIMARY KEY,
+        total INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS deck_name_counts (
+        deck_id INTEGER NOT NULL,
+        card_name TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (deck_id, card_name)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deck_cards_count_insert AFTER INSERT ON deck_cards
+    BEGIN
+        INSERT INTO deck_totals (deck_id, total) VALUES (NEW.deck_id, NEW.count)
+        ON CONFLICT (deck_id) DO UPDATE SET total = total + excluded.total;
+        INSERT INTO deck_name_counts (deck_id, card_name, count)
+        VALUES (NEW.deck_id, coalesce((SELECT name FROM cards WHERE id = NEW.card_id), ''), NEW.count)
+        ON CONFLICT (deck_id, card_name) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deck_cards_count_delete AFTER DELETE ON deck_cards
+    BEGIN
+        UPDATE deck_totals SET total = total - OLD.count WHERE deck_id = OLD.deck_id;
+        DELETE FROM deck_totals WHERE deck_id = OLD.deck_id AND total <= 0;
+        UPDATE deck_name_counts SET count = count - OLD.count
+        WHERE deck_id = OLD.deck_id AND card_name = coalesce((SELECT name FROM cards WHERE id = OLD.card_id), '');
+        DELETE FROM deck_name_counts
+        WHERE deck_id = OLD.deck_id AND card_name = coalesce((SELECT name FROM cards WHERE id = OLD.card_id), '')
+            AND count <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deck_cards_count_update AFTER UPDATE ON deck_cards
+    BEGIN
+        UPDATE deck_totals SET total = total - OLD.count WHERE deck_id = OLD.deck_id;
+        UPDATE deck_name_counts SET count = count - OLD.count
+        WHERE deck_id = OLD.deck_id AND card_name = coalesce((SELECT name FROM cards WHERE id = OLD.card_id), '');
+        INSERT INTO deck_totals (deck_id, total) VALUES (NEW.deck_id, NEW.count)
+        ON CONFLICT (deck_id) DO UPDATE SET total = total + excluded.total;
+        INSERT INTO deck_name_counts (deck_id, card_name, count)
+        VALUES (NEW.deck_id, coalesce((SELECT name FROM cards WHERE id = NEW.card_id), ''), NEW.count)
+        ON CONFLICT (deck_id, card_name) DO UPDATE SET count = count + excluded.count;
+        DELETE FROM deck_totals WHERE deck_id IN (OLD.deck_id, NEW.deck_id) AND total <= 0;
+        DELETE FROM deck_name_counts WHERE deck_id IN (OLD.deck_id, NEW.deck_id) AND count <= 0;
+    END
+    """,
+)
+
+def energy_type_code(value) -> int:
+    """Return the type_code for an energy type name in any known spelling, or 0"""
+    name = str(value or "").strip().casefold()
+    name = ENERGY_TYPE_ALIASES.get(name, name)
+    return ENERGY_TYPES.index(name) + 1 if name in ENERGY_TYPES else 0
+
+def category_code(card_type) -> int:
+    """Return the category_code for a card_type; Pokemon are scraped with no card_type"""
+    text = str(card_type or "").strip().casefold()
+    if not text:
+        return CATEGORY_POKEMON
+    if "tool" in text:
+        return CATEGORY_TOOL
+    if "supporter" in text:
+        return CATEGORY_SUPPORTER
+    if "energy" in text:
+        return CATEGORY_ENERGY
+    if "trainer" in text or "item" in text:
+        return CATEGORY_ITEM
+    if "pokémon" in text or "pokemon" in text:
+        return CATEGORY_POKEMON
+    return CATEGORY_UNKNOWN
+
+def ensure_card_indexes(conn: sqlite3.Connection) -> None:
+    """Create the filter indexes on whichever of their tables exist"""
+    cursor = conn.cursor()
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table, index_name, statement in CARD_INDEXES:
+        if table in tables:
+            cursor.execute(statement)
+    conn.commit()
+
+def load_json_list(value) -> list:
+    """Decode a JSON list column, treating NULL and malformed text as empty"""
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return decoded if isinstance(decoded, list) else []
+
+def parse_damage(text):
+    """Return the base damage of an attack ("30", "50+", "20x" -> 30, 50, 20), or None"""
+    match = re.match(r"\s*\+?(\d+)", str(text or ""))
+    return int(match.group(1)) if match else None
+
+def normalize_card_details(moves: list, weakness: list, weakness_damage) -> tuple:
+    """Return a card's (attacks, weaknesses) as tuples ready for card_detail_rows.
+
+    An attack is (position, name, description, damage, damage_text,
+    energy_count, costs), costs being (energy_type, count) pairs; a weakness
+    is (energy_type, damage).
+    """
+    attacks = []
+    for position, move in enumerate(moves):
+        if not isinstance(move, dict):
+            continue
+        energy_cost = [energy for energy in move.get('energy_cost') or [] if energy]
+        counts = {}
+        for energy in energy_cost:
+            counts[energy] = counts.get(energy, 0) + 1
+        attacks.append((
+            position,
+            move.get('name') or '',
+            move.get('description') or '',
+            parse_damage(move.get('damage')),
+            move.get('damage') or '',
+            len(energy_cost),
+            tuple(counts.items()),
+        ))
+
+    weaknesses = tuple((energy, parse_damage(weakness_damage)) for energy in weakness if energy)
+    return tuple(attacks), weaknesses
+
+def card_detail_rows(card_id: int, first_move_id: int, details: tuple) -> tuple:
+    """Return the (moves, move_costs, card_weakness) rows for one card, its moves numbered from first_move_id"""
+    attacks, weaknesses = details
+    move_rows = []
+    cost_rows = []
+    for move_id, (position, name, description, damage, damage_text, energy_count, costs) in enumerate(
+            attacks, first_move_id):
+        move_rows.append((move_id, card_id, position, name, description, damage, damage_text, energy_count))
+        cost_rows.extend((move_id, energy, count) for energy, count in costs)
+
+    weakness_rows = [(card_id, energy, damage) for energy, damage in weaknesses]
+    return move_rows, cost_rows, weakness_rows
+
+def next_move_id(cursor) -> int:
+    return cursor.execute("SELECT coalesce(max(id), 0) + 1 FROM moves").fetchone()[0]
+
+def insert_detail_rows(cursor, move_rows: list, cost_rows: list, weakness_rows: list) -> None:
+    cursor.executemany("""
+        INSERT INTO moves (id, card_id, position, name, description, damage, damage_text, energy_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, move_rows)
+    cursor.executemany("INSERT INTO move_costs (move_id, energy_type, count) VALUES (?, ?, ?)", cost_rows)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO card_weakness (card_id, energy_type, damage) VALUES (?, ?, ?)",
+        weakness_rows
+    )
+
+def insert_card_details(cursor, card_id: int, moves: list, weakness: list, weakness_damage) -> None:
+    """Write the moves, move_costs and card_weakness rows for one card"""
+    details = normalize_card_details(moves, weakness, weakness_damage)
+    insert_detail_rows(cursor, *card_detail_rows(card_id, next_move_id(cursor), details))
+
+def migrate_card_details(cursor) -> None:
+    """Schema 1: add cards.retreat_count and fill the moves, move_costs and card_weakness tables"""
+    for statement in CARD_DETAIL_SCHEMA:
+        cursor.execute(statement)
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(cards)")}
+    if "retreat_count" not in columns:
+        cursor.execute("ALTER TABLE cards ADD COLUMN retreat_count INTEGER")
+
+    cursor.execute("DELETE FROM move_costs")
+    cursor.execute("DELETE FROM moves")
+    cursor.execute("DELETE FROM card_weakness")
+    rows = cursor.execute(
+        "SELECT id, moves, weakness, weakness_damage, retreat_cost FROM cards"
+    ).fetchall()
+    for card_id, moves, weakness, weakness_damage, retreat_cost in rows:
+        insert_card_details(cursor, card_id, load_json_list(moves), load_json_list(weakness), weakness_damage)
+        cursor.execute(
+            "UPDATE cards SET retreat_count = ? WHERE id = ?",
+            (len(load_json_list(retreat_cost)), card_id)
+        )
+
+def migrate_card_codes(cursor) -> None:
+    """Schema 2: add the integer type_code and category_code columns that the filters test"""
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(cards)")}
+    for column in ("type_code", "category_code"):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE cards ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    conn = cursor.connection
+    conn.create_function("energy_type_code", 1, energy_type_code, deterministic=True)
+    conn.create_function("category_code", 1, category_code, deterministic=True)
+    cursor.execute("UPDATE cards SET type_code = energy_type_code(type), category_code = category_code(card_type)")
+
+    # The schema 1 filter indexes were over the text columns
+    for index in ("idx_cards_set_filters", "idx_cards_category_type", "idx_cards_type_set"):
+        cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+def bump_catalog_version(cursor, search_index_updated: bool = False) -> None:
+    """Tell running apps that the cards changed, so they drop their cached catalog and filter results.
+
+    A writer that updated the full-text index along with the cards passes
+    search_index_updated, which keeps the index current if it was before.
+    """
+    if search_index_updated:
+        cursor.execute("""
+        UPDATE search_index_version SET catalog_version = catalog_version + 1
+        WHERE catalog_version = (SELECT version FROM catalog_version WHERE id = 1)
+        """)
+    cursor.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+
+def mark_search_index_current(cursor) -> None:
+    """Record that the full-text index matches the cards at the current catalog version"""
+    cursor.execute(
+        "UPDATE search_index_version SET catalog_version = (SELECT version FROM catalog_version WHERE id = 1)"
+    )
+
+def rebuild_deck_aggregates(cursor) -> None:
+    """Recount deck_totals and deck_name_counts from deck_cards, e.g. after the cards were re-imported"""
+    cursor.execute("DELETE FROM deck_totals")
+    cursor.execute("DELETE FROM deck_name_counts")
+    cursor.execute("""
+    INSERT INTO deck_totals (deck_id, total)
+    SELECT deck_id, sum(count) FROM deck_cards GROUP BY deck_id HAVING sum(count) > 0
+    """)
+    cursor.execute("""
+    INSERT INTO deck_name_counts (deck_id, card_name, count)
+    SELECT dc.deck_id, coalesce(c.name, ''), sum(dc.count)
+    FROM deck_cards dc LEFT JOIN cards c ON c.id = dc.card_id
+    GROUP BY dc.deck_id, coalesce(c.name, '')
+    HAVING sum(dc.count) > 0
+    """)
+
+def migrate_deck_aggregates(cursor) -> None:
+    """Schema 3: add the per-deck totals and copies per card name, kept up to date by triggers"""
+    for statement in DECK_AGGREGATE_SCHEMA:
+        cursor.execute(statement)
+    rebuild_deck_aggregates(cursor)
+
+def migrate_catalog_version(cursor) -> None:
+    """Schema 4: add the catalog version counter that writers of the cards table bump"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS catalog_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 1)")
+
+def card_content_hash(*values) -> str:
+    """Hash the card_row values of a card, which are also the columns it is stored in"""
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def migrate_content_hash(cursor) -> None:
+    """Schema 5: add cards.content_hash, so a re-import can tell which cards changed"""
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(cards)")}
+    if "content_hash" not in columns:
+        cursor.execute("ALTER TABLE cards ADD COLUMN content_hash TEXT")
+
+    cursor.connection.create_function("card_content_hash", 17, card_content_hash, deterministic=True)
+    cursor.execute("""
+    UPDATE cards SET content_hash = card_content_hash(
+        name, set_name, set_number, hp, type, image_path,
+        weakness, retreat_cost, weakness_damage,
+        available_booster_packs, moves, card_type, description, rule_text,
+        retreat_count, type_code, category_code
+    )
+    """)
+
+def migrate_card_identity(cursor) -> None:
+    """Schema 6: identify cards by (set_name, set_number), so every printing of a name can be stored.
+
+    Card ids, and so deck_cards, are unchanged. Numbers without a digit, the
+    set's name that a scrape finding none falls back to, get the card's name
+    appended, as card_set_number does for new imports. Cards still sharing a
+    number get their id appended to it, all but the first, so the new key
+    can be unique.
+    """
+    cursor.execute("""
+    UPDATE cards SET set_number = trim(coalesce(set_number, '') || ' ' || name)
+    WHERE coalesce(set_number, '') NOT GLOB '*[0-9]*'
+    """)
+    cursor.execute("""
+    UPDATE cards SET set_number = coalesce(set_number, '') || ' #' || id
+    WHERE EXISTS (
+        SELECT 1 FROM cards AS first
+        WHERE first.set_name = cards.set_name AND first.set_number IS cards.set_number AND first.id < cards.id
+    )
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_cards_name_set")
+    cursor.execute(CARD_KEY_INDEX)
+
+def migrate_search_index_version(cursor) -> None:
+    """Schema 7: record the catalog version the full-text index was last built for.
+
+    An empty cards table has an empty, so current, index. Otherwise it starts
+    at 0 and the index is rebuilt once: it may have missed cards changed in
+    place, which a row count cannot tell.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS search_index_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        catalog_version INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("""
+    INSERT OR IGNORE INTO search_index_version (id, catalog_version)
+    SELECT 1, CASE WHEN EXISTS (SELECT 1 FROM cards) THEN 0 ELSE version END FROM catalog_version WHERE id = 1
+    """)
+
+# (user_version, migration) applied in order to databases older than the version
+SCHEMA_MIGRATIONS = (
+    (1, migrate_card_details),
+    (2, migrate_card_codes),
+    (3, migrate_deck_aggregates),
+    (4, migrate_catalog_version),
+    (5, migrate_content_hash),
+    (6, migrate_card_identity),
+    (7, migrate_search_index_version),
+)
+
+def ensure_database_schema(conn: sqlite3.Connection) -> None:
+    """Apply pending schema migrations, tracked in PRAGMA user_version, then create the indexes"""
+    cursor = conn.cursor()
+    has_cards = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cards'"
+    ).fetchone()
+    if has_cards:
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        for target_version, migrate in SCHEMA_MIGRATIONS:
+            if version < target_version:
+                migrate(cursor)
+                cursor.execute(f"PRAGMA user_version = {target_version}")
+                conn.commit()
+                version = target_version
+    ensure_card_indexes(conn)
+
+def card_search_text(card: dict) -> tuple:
+    """Return the (name, attacks, effect) text indexed for a card"""
+    attacks = " ".join(
+        f"{move.get('name', '')} {move.get('description', '')}"
+        for move in card.get('moves') or []
+    )
+    effect = " ".join(
+        text for text in (card.get('description'), card.get('rule_text')) if text
+    )
+    return card.get('name', ''), attacks, effect
+
+def rebuild_search_index(cursor) -> None:
+    """Rebuild the full-text index from the rows currently in the cards table"""
+    cursor.execute(SEARCH_INDEX_SCHEMA)
+    cursor.execute("DELETE FROM cards_fts")
+    cursor.execute("""
+    INSERT INTO cards_fts (rowid, name, attacks, effect)
+    SELECT
+        c.id,
+        c.name,
+        (SELECT group_concat(
+            coalesce(json_extract(m.value, '$.name'), '') || ' ' ||
+            coalesce(json_extract(m.value, '$.description'), ''), ' ')
+         FROM json_each(CASE WHEN json_valid(c.moves) THEN c.moves ELSE '[]' END) m),
+        trim(coalesce(c.description, '') || ' ' || coalesce(c.rule_text, ''))
+    FROM cards c
+    """)
+
+def ensure_search_index(conn: sqlite3.Connection) -> None:
+    """Rebuild the full-text index if it is missing or was built for an older catalog version.
+
+    The importers keep the index up to date as they write and mark it current;
+    any other writer that bumps the catalog version leaves it to be rebuilt here.
+    """
+    cursor = conn.cursor()
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cards_fts'"
+    ).fetchone()
+    if exists:
+        current = cursor.execute("""
+            SELECT 1 FROM search_index_version, catalog_version
+            WHERE catalog_version.id = 1 AND search_index_version.catalog_version = catalog_version.version
+        """).fetchone()
+        if current:
+            return
+    rebuild_search_index(cursor)
+    mark_search_index_current(cursor)
+    conn.commit()
+
+# Both take card_row(card) followed by the card's content hash; CARD_UPDATE
+# leaves out the (set_name, set_number) key and ends with the id of the row to rewrite
+CARD_INSERT = """
+INSERT INTO cards (
+    name, set_name, set_number, hp, type, image_path,
+    weakness, retreat_cost, weakness_damage,
+    available_booster_packs, moves, card_type, description, rule_text,
+    retreat_count, type_code, category_code, content_hash
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+CARD_UPDATE = """
+UPDATE cards SET
+    name = ?, hp = ?, type = ?, image_path = ?,
+    weakness = ?, retreat_cost = ?, weakness_damage = ?,
+    available_booster_packs = ?, moves = ?, card_type = ?, description = ?, rule_text = ?,
+    retreat_count = ?, type_code = ?, category_code = ?, content_hash = ?
+WHERE id = ?
+"""
+
+# Prepared batches a parsing worker may queue per file before it waits for the writer
+PIPELINE_QUEUE_BATCHES = 4
+# How long the writer waits on a worker's queue before checking that the workers are still running
+PIPELINE_POLL_SECONDS = 1
+
+# What --bulk imports when no --input is given
+DEFAULT_BULK_INPUTS = ['pokemon_cards_*.json', 'pokemon_cards_*.ndjson', 'pokemon_cards_*.ndjson.gz']
+
+# Pragmas for a bulk load: no fsync until the end. The page cache stays at the
+# connection's fixed size so memory use does not grow with the dump; a larger
+# cache was no faster. The whole load is one transaction, so a crash leaves the
+# old database.
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+)
+
+def drop_card_tables(cursor) -> None:
+    """Drop the cards and every table derived from them, so the next import starts from schema 0.
+
+    The (set_name, set_number) of every card in a deck is kept in a temp table
+    first, for restore_deck_cards to point the decks at the re-imported cards.
+    """
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    cursor.execute("DROP TABLE IF EXISTS temp.deck_card_keys")
+    if {"cards", "deck_cards"} <= tables:
+        cursor.execute("""
+        CREATE TEMP TABLE deck_card_keys AS
+        SELECT dc.deck_id, dc.card_id, dc.count, c.set_name, c.set_number
+        FROM deck_cards dc JOIN cards c ON c.id = dc.card_id
+        """)
+    cursor.execute("DROP TABLE IF EXISTS cards")
+    cursor.execute("DROP TABLE IF EXISTS cards_fts")
+    cursor.execute("DROP TABLE IF EXISTS move_costs")
+    cursor.execute("DROP TABLE IF EXISTS moves")
+    cursor.execute("DROP TABLE IF EXISTS card_weakness")
+    cursor.execute("PRAGMA user_version = 0")
+
+def restore_deck_cards(cursor) -> None:
+    """Point the deck cards saved by drop_card_tables at the new ids of the same printings.
+
+    Deck cards whose printing was not re-imported are removed, since their old
+    id may now belong to another card.
+    """
+    if cursor.execute("SELECT 1 FROM temp.sqlite_master WHERE name = 'deck_card_keys'").fetchone() is None:
+        return
+    saved = cursor.execute("""
+        SELECT k.deck_id, k.card_id, c.id, k.count FROM temp.deck_card_keys k
+        LEFT JOIN cards c ON c.set_name = k.set_name AND c.set_number = k.set_number
+    """).fetchall()
+    cursor.executemany(
+        "DELETE FROM deck_cards WHERE deck_id = ? AND card_id = ?",
+        [(deck_id, old_id) for deck_id, old_id, new_id, count in saved]
+    )
+    cursor.executemany(
+        "INSERT INTO deck_cards (deck_id, card_id, count) VALUES (?, ?, ?)",
+        [(deck_id, new_id, count) for deck_id, old_id, new_id, count in saved if new_id is not None]
+    )
+    cursor.execute("DROP TABLE temp.deck_card_keys")
+    missing_count = sum(1 for deck_id, old_id, new_id, count in saved if new_id is None)
+    if missing_count > 0:
+        print(f"Removed {missing_count} deck cards that are no longer in the imported sets")
+
+def create_card_tables(conn: sqlite3.Connection) -> None:
+    """Create the cards table and its search index if missing and bring the schema up to date"""
+    cursor = conn.cursor()
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS cards (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        set_name TEXT NOT NULL,
+        set_number TEXT,
+        hp INTEGER,
+        type TEXT,
+        image_path TEXT,
+        weakness TEXT,
+        retreat_cost TEXT,
+        weakness_damage TEXT,
+        available_booster_packs TEXT,
+        moves TEXT,
+        card_type TEXT,
+        description TEXT,
+        rule_text TEXT,
+        retreat_count INTEGER,
+        type_code INTEGER NOT NULL DEFAULT 0,
+        category_code INTEGER NOT NULL DEFAULT 0,
+        content_hash TEXT
+    )
+    """)
+    
+    # Full-text index over names, attacks and effect text, keyed by card id
+    cursor.execute(SEARCH_INDEX_SCHEMA)
+
+    # Bring older databases up to date and create the attack and weakness tables
+    ensure_database_schema(conn)
+
+    # Create a unique index on set_name + set_number to prevent duplicates, once
+    # schema 6 has made older databases' numbers unique
+    cursor.execute(CARD_KEY_INDEX)
+
+def card_set_number(card: dict) -> str:
+    """Return a card's set number, part of its (set_name, set_number) key.
+
+    A scrape that finds no number falls back to the set's name, the same for
+    every such card in the set, so a number without a digit gets the card's
+    name appended to keep their keys apart.
+    """
+    set_number = card.get('set_number') or ''
+    if re.search(r"\d", set_number):
+        return set_number
+    return f"{set_number} {card.get('name', '')}".strip()
+
+def card_row(card: dict) -> tuple:
+    """Return the CARD_INSERT parameters for a card from the scraper's JSON"""
+    return (
+        card.get('name', ''),
+        card.get('set_name', 'unknown'),
+        card_set_number(card),
+        card.get('hp'),
+        card.get('type'),
+        card.get('local_image_path'),
+        json.dumps(card.get('weakness', [])),
+        json.dumps(card.get('retreat_cost', [])),
+        card.get('weakness_damage'),
+        card.get('available_booster_packs', ''),
+        json.dumps(card.get('moves', [])),
+        card.get('card_type') or '',
+        card.get('description', ''),
+        card.get('rule_text', ''),
+        len(card.get('retreat_cost') or []),
+        energy_type_code(card.get('type')),
+        category_code(card.get('card_type'))
+    )
+
+def prepare_card(card) -> tuple:
+    """Validate, normalize and hash one card record into what sync_card_batch writes, or None if invalid.
+
+    The result is plain tuples (card_row, content hash, normalized details,
+    search text), cheap to send from a worker process to the writer.
+    """
+    if not isinstance(card, dict) or not card.get('name') or not isinstance(card.get('moves') or [], list):
+        return None
+    row = card_row(card)
+    details = normalize_card_details(card.get('moves') or [], card.get('weakness') or [], card.get('weakness_damage'))
+    return row, card_content_hash(*row), details, card_search_text(card)
+
+def prepare_cards(cards: list) -> list:
+    return [prepare_card(card) for card in cards]
+
+def begin_card_sync(cursor) -> None:
+    """Start recording the cards an import has seen, so a repeated card counts as a duplicate"""
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS imported_cards (id INTEGER PRIMARY KEY)")
+    cursor.execute("DELETE FROM temp.imported_cards")
+
+def sync_card_batch(cursor, prepared: list, stats: Counter, phase=None) -> None:
+    """Add the new cards of a batch and rewrite the changed ones in place, keeping their ids.
+
+    Takes prepare_card results; invalid records (None) are counted and
+    skipped. Cards are identified by (set_name, set_number) and their content
+    hashed once: a stored card is changed when its content_hash differs from the
+    incoming record's, and its moves, weaknesses and search row are replaced.
+    A card seen earlier in the import, including earlier batches, is a
+    duplicate if its content is the same and a conflict if not; either way
+    the first occurrence wins. Counts of each outcome are added to stats, and
+    phase(name), if given, is called as each step ends.
+    """
+    stats["invalid"] += prepared.count(None)
+    prepared = [card for card in prepared if card is not None]
+    keys = json.dumps([[row[1], row[2]] for row, content_hash, details, search_text in prepared])
+    stored = {
+        (set_name, set_number): (card_id, content_hash, seen)
+        for set_name, set_number, card_id, content_hash, seen in cursor.execute("""
+            SELECT cards.set_name, cards.set_number, cards.id, cards.content_hash, imported_cards.id IS NOT NULL
+            FROM json_each(?) AS card_key
+            JOIN cards ON cards.set_name = json_extract(card_key.value, '$[0]')
+                AND cards.set_number = json_extract(card_key.value, '$[1]')
+            LEFT JOIN temp.imported_cards ON imported_cards.id = cards.id
+        """, (keys,))
+    }
+
+    batch_hashes = {}
+    added = []
+    changed = []
+    unchanged_ids = []
+    for card in prepared:
+        row, content_hash, details, search_text = card
+        key = (row[1], row[2])
+        first_hash = batch_hashes.get(key)
+        if first_hash is not None:
+            stats["duplicates" if first_hash == content_hash else "conflicts"] += 1
+            continue
+        batch_hashes[key] = content_hash
+        card_id, stored_hash, seen = stored.get(key, (None, None, False))
+        if seen:
+            stats["duplicates" if stored_hash == content_hash else "conflicts"] += 1
+        elif card_id is None:
+            added.append(card)
+        elif stored_hash == content_hash:
+            unchanged_ids.append(card_id)
+        else:
+            changed.append((card_id, card))
+    stats["added"] += len(added)
+    stats["changed"] += len(changed)
+    stats["unchanged"] += len(unchanged_ids)
+    if phase:
+        phase("match")
+
+    first_card_id = cursor.execute("SELECT coalesce(max(id), 0) + 1 FROM cards").fetchone()[0]
+    cursor.executemany(CARD_INSERT, [(*row, content_hash) for row, content_hash, details, search_text in added])
+    cursor.executemany(CARD_UPDATE, [
+        (row[0], *row[3:], content_hash, card_id) for card_id, (row, content_hash, details, search_text) in changed
+    ])
+    written = list(enumerate(added, first_card_id)) + changed
+    if phase:
+        phase("write cards")
+
+    changed_ids = json.dumps([card_id for card_id, card in changed])
+    if changed:
+        cursor.execute("""
+            DELETE FROM move_costs WHERE move_id IN (
+                SELECT id FROM moves WHERE card_id IN (SELECT value FROM json_each(?))
+            )
+        """, (changed_ids,))
+        cursor.execute("DELETE FROM moves WHERE card_id IN (SELECT value FROM json_each(?))", (changed_ids,))
+        cursor.execute("DELETE FROM card_weakness WHERE card_id IN (SELECT value FROM json_each(?))", (changed_ids,))
+    move_rows, cost_rows, weakness_rows = [], [], []
+    move_id = next_move_id(cursor)
+    for card_id, (row, content_hash, details, search_text) in written:
+        rows = card_detail_rows(card_id, move_id, details)
+        move_rows.extend(rows[0])
+        cost_rows.extend(rows[1])
+        weakness_rows.extend(rows[2])
+        move_id += len(rows[0])
+    insert_detail_rows(cursor, move_rows, cost_rows, weakness_rows)
+    if phase:
+        phase("write details")
+
+    if changed:
+        cursor.execute("DELETE FROM cards_fts WHERE rowid IN (SELECT value FROM json_each(?))", (changed_ids,))
+    cursor.executemany(
+        "INSERT INTO cards_fts (rowid, name, attacks, effect) VALUES (?, ?, ?, ?)",
+        [(card_id, *search_text) for card_id, (row, content_hash, details, search_text) in written]
+    )
+    cursor.execute(
+        "INSERT INTO temp.imported_cards (id) SELECT value FROM json_each(?)",
+        (json.dumps([card_id for card_id, card in written] + unchanged_ids),)
+    )
+    if phase:
+        phase("search index")
+
+def print_sync_stats(stats: Counter) -> None:
+    if stats["invalid"] > 0:
+        print(f"Skipped {stats['invalid']} records that are not cards (no name, or malformed attacks)")
+    if stats["duplicates"] > 0:
+        print(f"Collapsed {stats['duplicates']} duplicate cards")
+    if stats["conflicts"] > 0:
+        print(f"Skipped {stats['conflicts']} cards whose set number was already imported with other content")
+
+def import_cards_from_json(json_file: str, db_path: str, force_recreate: bool = False,
+                           query_stats: QueryStats = None) -> None:
+    """Import Pokemon cards from a JSON file to a SQLite database, recording its queries in query_stats if given.
+
+    New cards are added and cards whose content changed are updated in place,
+    so the ids that decks refer to stay the same. An error is printed and
+    raised again, so callers (and the exit status) see the import fail.
+    """
     try:
-        # Load the cards from the JSON file
-        with open(json_file, 'r', encoding='utf-8') as f:
-            cards = json.load(f)
-        
         # Connect to the database
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path, query_stats=query_stats)
         cursor = conn.cursor()
         
         # Create the table if it doesn't exist
         if force_recreate:
             print("Dropping existing cards table...")
-            cursor.execute("DROP TABLE IF EXISTS cards")
-            
-        # Create the table with updated schema for Trainer and Tool cards
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS cards (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            set_name TEXT NOT NULL,
-            set_number TEXT,
-            hp INTEGER,
-            type TEXT,
-            image_path TEXT,
-            weakness TEXT,
-            retreat_cost TEXT,
-            weakness_damage TEXT,
-            available_booster_packs TEXT,
-            moves TEXT,
-            card_type TEXT,
-            description TEXT,
-            rule_text TEXT
-        )
-        """)
-        
-        # Create a unique index on name + set_name to prevent duplicates
-        cursor.execute("""
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_cards_name_set ON cards(name, set_name)
-        """)
+            drop_card_tables(cursor)
+        create_card_tables(conn)
 
-        # Prepare the insert statement with OR IGNORE to skip duplicates
-        insert_stmt = """
-        INSERT OR IGNORE INTO cards (
-            name, set_name, set_number, hp, type, image_path, 
-            weakness, retreat_cost, weakness_damage, 
-            available_booster_packs, moves, card_type, description, rule_text
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-
-        # Insert each card
-        card_count = 0
-        duplicate_count = 0
-        for card in cards:
-            # Convert moves, weakness and retreat cost to JSON strings
-            moves_json = json.dumps(card.get('moves', []))
-            weakness_json = json.dumps(card.get('weakness', []))
-            retreat_cost_json = json.dumps(card.get('retreat_cost', []))
-            
-            # Get or set default set name
-            set_name = card.get('set_name', 'unknown')
-            
-            try:
-                cursor.execute(insert_stmt, (
-                    card.get('name', ''),
-                    set_name,
-                    card.get('set_number', ''),
-                    card.get('hp'),
-                    card.get('type'),
-                    card.get('local_image_path'),
-                    weakness_json,
-                    retreat_cost_json,
-                    card.get('weakness_damage'),
-                    card.get('available_booster_packs', ''),
-                    moves_json,
-                    card.get('card_type', ''),
-                    card.get('description', ''),
-                    card.get('rule_text', '')
-                ))
-                if cursor.rowcount > 0:
-                    card_count += 1
-                else:
-                    duplicate_count += 1
-            except sqlite3.IntegrityError:
-                # This happens if there's a duplicate card (same name, same set)
-                duplicate_count += 1
-                print(f"Duplicate card skipped: {card.get('name')} in set {set_name}")
+        # Add or update the cards a batch at a time
+        begin_card_sync(cursor)
+        stats = Counter()
+        for cards in read_card_batches([json_file]):
+            sync_card_batch(cursor, prepare_cards(cards), stats)
+        restore_deck_cards(cursor)
+
+        # Deck limits count copies by card name, which the import may have changed
+        rebuild_deck_aggregates(cursor)
+        if force_recreate or stats["added"] > 0 or stats["changed"] > 0:
+            bump_catalog_version(cursor, search_index_updated=True)
+        if force_recreate:
+            # Every card was indexed afresh
+            mark_search_index_current(cursor)
 
         # Commit changes and close connection
         conn.commit()
         conn.close()
-        print(f"Successfully imported {card_count} cards into the database")
-        if duplicate_count > 0:
-            print(f"Skipped {duplicate_count} duplicate cards")
+        print(f"Successfully imported {json_file}: {stats['added']} cards added, {stats['changed']} changed, "
+              f"{stats['unchanged']} unchanged")
+        print_sync_stats(stats)
 
     except Exception as e:
         print(f"Error importing cards: {e}")
-        import traceback
-        traceback.print_exc()
         if 'conn' in locals():
             conn.close()
+        raise
+
+def drop_card_indexes(cursor) -> None:
+    """Drop the CARD_INDEXES, so a bulk load does not update them row by row"""
+    for table, index_name, statement in CARD_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+def _prepare_files(tasks, results: list, batch_size: int) -> None:
+    """Worker process: prepare each (index, path) taken from tasks into results[index], then None"""
+    for index, path in iter(tasks.get, None):
+        queue = results[index]
+        try:
+            for cards in read_card_batches([path], batch_size):
+                queue.put(prepare_cards(cards))
+        except Exception as e:
+            # Passed on as text, since not every exception can be pickled
+            queue.put(f"{path}: {e}")
+        queue.put(None)
+
+def _next_batch(queue, processes: list):
+    """Take the next item from a worker's queue, raising if the workers died before sending it"""
+    while True:
+        # Whatever a worker put before it exited is already in the queue's pipe,
+        # so a wait that began after every worker exited and found nothing means
+        # the batch will never come
+        alive = any(process.is_alive() for process in processes)
+        try:
+            return queue.get(timeout=PIPELINE_POLL_SECONDS)
+        except Empty:
+            pass
+        failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+        if failed:
+            raise RuntimeError(f"A card preparation worker exited with code {failed[0]}")
+        if not alive:
+            raise RuntimeError("The card preparation workers exited before sending every batch")
+
+def prepared_card_batches(json_files: list, batch_size: int = RECORD_BATCH_SIZE, workers: int = 1):
+    """Yield the prepare_cards batches of every file, in file order.
+
+    With more than one worker, that many processes parse, validate and
+    normalize files at the same time while the caller, the one writer, takes
+    their batches from a queue per file. Each queue holds at most
+    PIPELINE_QUEUE_BATCHES batches, so workers stay only that far ahead of
+    the writer and memory use is bounded however many files there are. If a
+    worker dies (killed, or out of memory) the import fails instead of
+    waiting for batches that will never come.
+    """
+    if workers <= 1:
+        for cards in read_card_batches(json_files, batch_size):
+            yield prepare_cards(cards)
+        return
+
+    tasks = multiprocessing.Queue()
+    results = [multiprocessing.Queue(PIPELINE_QUEUE_BATCHES) for _ in json_files]
+    for task in enumerate(json_files):
+        tasks.put(task)
+    processes = [
+        multiprocessing.Process(target=_prepare_files, args=(tasks, results, batch_size), daemon=True)
+        for _ in range(min(workers, len(json_files)))
+    ]
+    for process in processes:
+        tasks.put(None)
+        process.start()
+    try:
+        for queue in results:
+            while (batch := _next_batch(queue, processes)) is not None:
+                if isinstance(batch, str):
+                    raise ValueError(f"Could not read {batch}")
+                yield batch
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+def bulk_import_cards(json_files: list, db_path: str, force_recreate: bool = False,
+                      query_stats: QueryStats = None, batch_size: int = RECORD_BATCH_SIZE,
+                      workers: int = 1) -> None:
+    """Import the cards of every file in one transaction and print the throughput of each phase.
+
+    Files are read in batches of batch_size cards (see read_card_records:
+    NDJSON is streamed, so memory use does not grow with the dump), prepared
+    by prepared_card_batches in up to workers processes, and each batch is
+    written by sync_card_batch on this connection, with fsync off. Loading
+    into an empty cards table also drops the filter indexes and builds them
+    once at the end; a re-import keeps them, since it only touches the cards
+    that changed.
+    """
+    phases = {}
+    started = perf_counter()
+
+    def phase(name: str) -> None:
+        nonlocal started
+        now = perf_counter()
+        phases[name] = phases.get(name, 0.0) + now - started
+        started = now
+
+    try:
+        conn = connect(db_path, query_stats=query_stats)
+        cursor = conn.cursor()
+        if force_recreate:
+            print("Dropping existing cards table...")
+            drop_card_tables(cursor)
+        create_card_tables(conn)
+        for pragma in BULK_LOAD_PRAGMAS:
+            cursor.execute(pragma)
+
+        cursor.execute("BEGIN")
+        initial_load = cursor.execute("SELECT 1 FROM cards LIMIT 1").fetchone() is None
+        if initial_load:
+            drop_card_indexes(cursor)
+        begin_card_sync(cursor)
+        phase("prepare")
+
+        record_count = 0
+        stats = Counter()
+        for prepared in prepared_card_batches(json_files, batch_size, workers):
+            record_count += len(prepared)
+            phase("read and parse")
+            sync_card_batch(cursor, prepared, stats, phase)
+
+        for table, index_name, statement in CARD_INDEXES:
+            cursor.execute(statement)
+        restore_deck_cards(cursor)
+        rebuild_deck_aggregates(cursor)
+        if force_recreate or stats["added"] > 0 or stats["changed"] > 0:
+            bump_catalog_version(cursor, search_index_updated=True)
+        if force_recreate:
+            # Every card was indexed afresh
+            mark_search_index_current(cursor)
+        phase("rebuild indexes")
+
+        conn.commit()
+        phase("commit")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        conn.close()
+
+        elapsed = sum(phases.values())
+        print(f"Read {record_count} cards from {len(json_files)} files in {elapsed:.2f} s "
+              f"({record_count / elapsed:.0f} cards/s): {stats['added']} added, {stats['changed']} changed, "
+              f"{stats['unchanged']} unchanged")
+        print_sync_stats(stats)
+        for name, seconds in phases.items():
+            print(f"  {name:<16} {seconds * 1000:>9.1f} ms")
+        if workers > 1:
+            print(f"  (files parsed by {min(workers, len(json_files))} worker processes; "
+                  f"read and parse is the time spent waiting for them)")
+
+    except Exception as e:
+        print(f"Error importing cards: {e}")
+        if 'conn' in locals():
+            conn.close()
+        raise
+
+def expand_inputs(patterns: list) -> list:
+    """Expand shell-style globs in patterns, keeping plain paths as given and dropping repeats"""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        files.extend(path for path in matches if path not in files)
+    return files
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Import Pokemon cards from JSON file to database')
-    parser.add_argument('--input', type=str, default=None,
-                       help='Input JSON file (default: pokemon_cards.json in the project root)')
+    parser.add_argument('--input', type=str, nargs='+', default=None,
+                       help='Input .json, .ndjson or .ndjson.gz files or globs (default with --bulk: pokemon_cards_*)')
     parser.add_argument('--db', type=str, default=None,
                        help='Database file path (default: db/pokemon_tcg.db in the project root)')
     parser.add_argument('--force', action='store_true',
-                       help='Force recreate table (use only if schema changed)')
+                       help='Drop and recreate the card tables; decks are re-pointed by set number '
+                            '(an import already updates changed cards in place)')
+    parser.add_argument('--bulk', action='store_true',
+                       help='Load every input file in one transaction and report throughput')
+    parser.add_argument('--batch-size', type=int, default=RECORD_BATCH_SIZE,
+                       help=f'Cards read and inserted at a time by --bulk (default: {RECORD_BATCH_SIZE})')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes that parse files in parallel for --bulk (0: one per CPU core)')
+    parser.add_argument('--query-stats', action='store_true',
+                       help='Print slow queries as they happen and a per-statement summary at the end')
     return parser.parse_args()
 
 def main():
@@ -125,18 +1012,28 @@ def main():
     project_root = Path(__file__).parent.parent
     
     # Define paths
-    json_file = args.input
+    json_files = expand_inputs(args.input or (DEFAULT_BULK_INPUTS if args.bulk else []))
     db_path = args.db if args.db else project_root / 'db' / 'pokemon_tcg.db'
-    if not json_file:
+    if not json_files:
         print("No input file provided")
         return
     
     # Make sure the db directory exists
     db_dir = os.path.dirname(db_path)
-    os.makedirs(db_dir, exist_ok=True)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
     
     # Import cards
-    import_cards_from_json(str(json_file), str(db_path), args.force)
+    query_stats = QueryStats(logger=logging.getLogger(__name__)) if args.query_stats else None
+    # --force drops the cards, so several files have to be loaded together
+    if args.bulk or (args.force and len(json_files) > 1):
+        workers = args.workers or os.cpu_count() or 1
+        bulk_import_cards(json_files, str(db_path), args.force, query_stats, args.batch_size, workers)
+    else:
+        for json_file in json_files:
+            import_cards_from_json(json_file, str(db_path), args.force, query_stats)
+    if query_stats is not None:
+        print(query_stats.format_summary())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -17,20 +17,11 @@ class Logger():
         self.logger.addHandler(self.handler)
 
     def create_folder_and_log(self, folder_path):
+        # Silent: the app starts on this terminal, and the FileHandler creates the file
         try:
-            if not os.path.exists(folder_path):
-                os.makedirs(folder_path)
-                print(f"Created folder: {folder_path}")
-                return True
-            else:
-                self.log_file_path = os.path.join(folder_path, "pokemontcgbuilder.log")
-                if not os.path.exists(self.log_file_path):
-                    with open(self.log_file_path, "w") as f:
-                        pass
-                    print(f"Created log file: {self.log_file_path}")
-                else:
-                    print(f"Log file already exists: {self.log_file_path}")
-                return True
+            os.makedirs(folder_path, exist_ok=True)
+            self.log_file_path = os.path.join(folder_path, "pokemontcgbuilder.log")
+            return True
 
         except Exception as e:
             print(f"Error: {e}")
@@ -0,0 +1,185 @@
+import logging
+import sqlite3
+import threading
+from time import perf_counter
+
+# Statements taking at least this long, from execute to their last fetch, go to the slow-query log
+SLOW_QUERY_MS = 50.0
+
+
+def statement_key(sql: str) -> str:
+    """Collapse whitespace so the same statement written on several lines is counted once"""
+    return " ".join(sql.split())
+
+
+class QueryStats:
+    """Per-statement counts, latencies and rows returned, shared by every connection given it.
+
+    Safe to record into from several threads. Statements slower than
+    slow_ms are written to logger (a logging.Logger) as warnings.
+    """
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, logger: logging.Logger = None):
+        self.slow_ms = slow_ms
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._statements = {}
+
+    def record(self, sql: str, seconds: float, rows: int) -> None:
+        key = statement_key(sql)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                entry = self._statements[key] = [0, 0.0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            entry[3] += rows
+        milliseconds = seconds * 1000
+        if self.logger is not None and milliseconds >= self.slow_ms:
+            self.logger.warning(f"Slow query ({milliseconds:.1f} ms, {rows} rows): {key}")
+
+    def summary(self) -> list:
+        """Return a dict per statement, the most total time first"""
+        with self._lock:
+            items = [(key, list(entry)) for key, entry in self._statements.items()]
+        rows = [
+            {
+                "sql": key,
+                "count": count,
+                "total_ms": total * 1000,
+                "mean_ms": total * 1000 / count,
+                "max_ms": slowest * 1000,
+                "rows": rows,
+            }
+            for key, (count, total, slowest, rows) in items
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self, limit: int = 20) -> str:
+        statements = self.summary()
+        lines = [
+            f"{sum(s['count'] for s in statements)} queries in {sum(s['total_ms'] for s in statements):.1f} ms "
+            f"across {len(statements)} statements",
+            f"{'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>8}  statement",
+        ]
+        for s in statements[:limit]:
+            sql = s["sql"] if len(s["sql"]) <= 100 else s["sql"][:97] + "..."
+            lines.append(
+                f"{s['count']:>7} {s['total_ms']:>10.1f} {s['mean_ms']:>9.2f} {s['max_ms']:>9.2f} {s['rows']:>8}  {sql}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement from execute() through its fetches.
+
+    A statement is recorded once it is finished with: when its rows run out,
+    the cursor runs another statement or is closed, or the cursor is dropped.
+    """
+
+    _statement = None
+
+    def _start(self, sql: str) -> None:
+        self._finish()
+        self._statement = [sql, 0.0, 0]
+
+    def _finish(self) -> None:
+        statement, self._statement = self._statement, None
+        if statement is not None:
+            self.connection.query_stats.record(*statement)
+
+    def _timed(self, method, *args):
+        start = perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._statement is not None:
+                self._statement[1] += perf_counter() - start
+
+    def execute(self, sql, parameters=()):
+        self._start(sql)
+        try:
+            self._timed(super().execute, sql, parameters)
+        except sqlite3.Error:
+            self._finish()
+            raise
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql)
+        try:
+            self._timed(super().executemany, sql, seq_of_parameters)
+        finally:
+            self._finish()
+        return self
+
+    def executescript(self, sql_script):
+        self._start(sql_script)
+        try:
+            self._timed(super().executescript, sql_script)
+        finally:
+            self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._statement is not None:
+            self._statement[2] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self._statement is not None:
+            self._statement[2] += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._statement is not None:
+            self._statement[2] += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._statement is not None:
+            self._statement[2] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements, however they are run, are recorded in query_stats"""
+
+    query_stats: QueryStats = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
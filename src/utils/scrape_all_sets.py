@@ -14,13 +14,12 @@ KNOWN_SETS = {
     "mythicalisland": "Mythical Island"
 }
 
-def scrape_set(set_name, should_import=False, force_recreate=False):
-    """Scrape a single set and optionally import it to the database
+def scrape_set(set_name, output_format="json"):
+    """Scrape a single set into pokemon_cards_<set_name>.<output_format>
     
     Args:
         set_name: The set identifier used in the URL (e.g., "shiningrevelry")
-        should_import: Whether to import to the database
-        force_recreate: Whether to force recreate the table (only use if schema changed)
+        output_format: json, or ndjson / ndjson.gz to write each card as it is scraped
     """
     if set_name not in KNOWN_SETS:
         print(f"Unknown set: {set_name}")
@@ -35,27 +34,36 @@ def scrape_set(set_name, should_import=False, force_recreate=False):
     print(f"{'='*80}\n")
     
     # Run the scraping script
-    cmd = [sys.executable, "src/scrape_pokemon_cards.py", "--url", url]
+    cmd = [sys.executable, "src/scrape_pokemon_cards.py", "--url", url, "--format", output_format]
     result = subprocess.run(cmd, check=False)
     
     if result.returncode != 0:
         print(f"Error scraping {display_name}")
         return False
     
-    # Import to database if requested
-    if should_import:
-        import_cmd = [sys.executable, "src/utils/import_cards.py", "--input", f"pokemon_cards_{set_name}.json"]
-        
-        # Add --force flag if requested
-        if force_recreate:
-            import_cmd.append("--force")
-            
-        print(f"\nImporting {display_name} cards to database...")
-        import_result = subprocess.run(import_cmd, check=False)
+    return True
+
+def import_sets(set_names, force_recreate=False, output_format="json"):
+    """Import the scraped sets to the database in one bulk load
+    
+    Args:
+        set_names: The set identifiers whose card files to import
+        force_recreate: Whether to force recreate the table (only use if schema changed)
+        output_format: The format the sets were scraped in
+    """
+    import_cmd = [sys.executable, "src/utils/import_cards.py", "--bulk", "--input"]
+    import_cmd.extend(f"pokemon_cards_{set_name}.{output_format}" for set_name in set_names)
+    
+    # Add --force flag if requested
+    if force_recreate:
+        import_cmd.append("--force")
         
-        if import_result.returncode != 0:
-            print(f"Error importing {display_name} to database")
-            return False
+    print(f"\nImporting {len(set_names)} sets to database...")
+    import_result = subprocess.run(import_cmd, check=False)
+    
+    if import_result.returncode != 0:
+        print("Error importing cards to database")
+        return False
     
     return True
 
@@ -67,6 +75,8 @@ def parse_arguments():
                         help='Import scraped cards to database')
     parser.add_argument('--force', action='store_true',
                         help='Force recreate database table (use only if schema changed)')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'ndjson.gz'], default='json',
+                        help='Card file format (default: json)')
     return parser.parse_args()
 
 def main():
@@ -75,12 +85,13 @@ def main():
     # Determine which sets to scrape
     sets_to_scrape = list(KNOWN_SETS.keys()) if 'all' in args.sets else args.sets
     
-    success_count = 0
-    for set_name in sets_to_scrape:
-        if scrape_set(set_name, args.import_db, args.force):
-            success_count += 1
+    scraped_sets = [set_name for set_name in sets_to_scrape if scrape_set(set_name, args.format)]
+    
+    print(f"\nSuccessfully scraped {len(scraped_sets)} out of {len(sets_to_scrape)} sets")
     
-    print(f"\nSuccessfully scraped {success_count} out of {len(sets_to_scrape)} sets")
+    # Import every scraped set at once, so --force drops the table only once
+    if args.import_db and scraped_sets:
+        import_sets(scraped_sets, args.force, args.format)
 
 if __name__ == "__main__":
     main() 
@@ -9,6 +9,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+try:
+    from utils.card_records import CardRecordWriter
+except ImportError:
+    from card_records import CardRecordWriter
+
 class PokemonCardScraper:
     def __init__(self, url: str):
         """Initialize the scraper with a URL to a Serebii TCG Pocket set page
@@ -540,7 +545,8 @@ class PokemonCardScraper:
         if set_number:
             card_data['set_number'] = set_number
         else:
-            # Fallback to a default set number pattern if we couldn't find it
+            # Fallback to a default set number pattern if we couldn't find it; the
+            # importer appends the card's name to keep such cards apart
             card_data['set_number'] = self.display_set_name
         
         # Find artist - also using a more robust approach
@@ -564,15 +570,18 @@ class PokemonCardScraper:
 
     def scrape_cards(self) -> List[Dict]:
         """Scrape Pokemon cards by following links from the main page to individual card pages"""
+        return list(self.iter_cards())
+
+    def iter_cards(self):
+        """Yield each Pokemon card as soon as its page has been scraped"""
         html_content = self.fetch_page(self.base_url)
         if not html_content:
-            return []
+            return
         
         # Extract links to individual card pages
         card_links = self.extract_card_links(html_content)
         print(f"Found {len(card_links)} card links for set: {self.display_set_name}")
         
-        cards = []
         # Process each card page
         for card_url, image_url in card_links:
             full_url = urljoin(self.base_url, card_url)
@@ -585,10 +594,8 @@ class PokemonCardScraper:
                 local_image_path = self.download_image(image_url, card_data['name'])
                 card_data['local_image_path'] = local_image_path
                 
-                cards.append(card_data)
                 print(f"Successfully scraped card: {card_data['name']} ({card_data.get('set_name', 'Unknown Set')})")
-            
-        return cards
+                yield card_data
 
     def save_to_json(self, cards: List[Dict], filename: str = None) -> None:
         """Save the scraped cards to a JSON file"""
@@ -600,17 +607,37 @@ class PokemonCardScraper:
         
         print(f"Saved {len(cards)} cards to {filename}")
 
+    def stream_to_ndjson(self, filename: str = None) -> int:
+        """Scrape the set straight into an NDJSON file (gzip-compressed if it ends in .gz), one line per card"""
+        if filename is None:
+            filename = f"pokemon_cards_{self.set_name}.ndjson"
+        
+        with CardRecordWriter(filename) as writer:
+            for card in self.iter_cards():
+                writer.write(card)
+        
+        print(f"Saved {writer.count} cards to {filename}")
+        return writer.count
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Scrape Pokemon cards from Serebii TCG Pocket')
     parser.add_argument('--url', type=str,
                         help='URL to scrape (example: https://www.serebii.net/tcgpocket/shiningrevelry/)')
     parser.add_argument('--output', type=str, default=None,
-                        help='Output JSON filename (default: pokemon_cards_<set_name>.json)')
+                        help='Output filename (default: pokemon_cards_<set_name>.<format>)')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'ndjson.gz'], default='json',
+                        help='json writes one array at the end; ndjson writes each card as it is scraped')
     return parser.parse_args()
 
 def main():
     args = parse_arguments()
     scraper = PokemonCardScraper(args.url)
+    if args.format != 'json':
+        output = args.output or f"pokemon_cards_{scraper.set_name}.{args.format}"
+        if not scraper.stream_to_ndjson(output):
+            print(f"No cards were scraped from {args.url}")
+        return
+    
     cards = scraper.scrape_cards()
     
     if cards:
@@ -0,0 +1,171 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image
+
+try:
+    from utils.db_connection import connect
+except ImportError:
+    from db_connection import connect
+
+# Version 2 keys the index by image path; version 1 stores, keyed by card id, are ignored
+MAGIC = b"PTCGTHM2"
+# magic, index offset, index length
+HEADER = struct.Struct("<8sQQ")
+# Widths, in pixels, that every card image is pre-rendered at
+STANDARD_WIDTHS = (40, 64, 96, 128)
+DEFAULT_STORE_PATH = "src/db/card_thumbnails.bin"
+
+
+class ThumbnailStore:
+    """Read-only, memory-mapped file of card images pre-rendered as raw RGB.
+
+    The file is a header, the pixel data of every variant, then a JSON index
+    mapping each source image's real path to its size, mtime and (width,
+    height, offset, length) variants. Showing a card is a slice of the map:
+    no JPEG decode and no resize. Entries are keyed by image rather than card
+    id, since a forced re-import gives the cards new ids.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a thumbnail store")
+            index = json.loads(self._map[index_offset:index_offset + index_length])
+        except Exception:
+            self._file.close()
+            raise
+        self.images = index["images"]
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_STORE_PATH):
+        """Open the store at path, or return None if it has not been built or is unreadable."""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __contains__(self, image_path) -> bool:
+        return os.path.realpath(image_path) in self.images
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def variant_for(self, image_path: str, target_size: tuple):
+        """Return the largest variant of an image that fits target_size, or None if it is missing or stale."""
+        entry = self.images.get(os.path.realpath(image_path))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        # A checkout gives every image the same mtime, so the size is compared too
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime"]:
+            return None
+
+        target_width, target_height = target_size
+        variants = entry["variants"]
+        best = variants[0]
+        for variant in variants:
+            if variant[0] <= target_width and variant[1] <= target_height:
+                best = variant
+        return best
+
+    def image(self, variant) -> Image.Image:
+        width, height, offset, length = variant
+        # A plain (writable) copy of the slice; PIL's per-pixel access is slower on
+        # read-only images that borrow the map's buffer
+        return Image.frombytes("RGB", (width, height), self._map[offset:offset + length])
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+@lru_cache(maxsize=1)
+def default_thumbnail_store():
+    """The store at DEFAULT_STORE_PATH shared by every CardImage, opened once."""
+    return ThumbnailStore.open(DEFAULT_STORE_PATH)
+
+
+def build_thumbnail_store(db_path: str, output_path: str, widths=STANDARD_WIDTHS) -> None:
+    """Pre-render every card image in the database into a packed thumbnail store"""
+    conn = connect(db_path, read_only=True)
+    rows = conn.execute(
+        "SELECT DISTINCT image_path FROM cards WHERE image_path IS NOT NULL AND image_path != ''"
+    ).fetchall()
+    conn.close()
+
+    images = {}
+    missing_count = 0
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for (image_path,) in rows:
+            if not os.path.exists(image_path):
+                missing_count += 1
+                continue
+            key = os.path.realpath(image_path)
+            if key in images:
+                continue
+            variants = []
+            with Image.open(image_path) as image:
+                image = image.convert("RGB")
+                for width in sorted(widths):
+                    if width > image.width and variants:
+                        break
+                    height = max(1, round(image.height * width / image.width))
+                    data = image.resize((width, height), Image.Resampling.LANCZOS).tobytes()
+                    variants.append([width, height, f.tell(), len(data)])
+                    f.write(data)
+            stat = os.stat(image_path)
+            images[key] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "variants": variants,
+            }
+
+        index = json.dumps({"widths": list(widths), "images": images}).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, index_offset, len(index)))
+
+    os.replace(temp_path, output_path)
+    print(f"Packed {len(images)} card images at widths {', '.join(map(str, widths))} into {output_path}")
+    if missing_count > 0:
+        print(f"Skipped {missing_count} card images whose file is missing")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Pre-render card images into a memory-mapped thumbnail store')
+    parser.add_argument('--db', type=str, default=None,
+                       help='Database file path (default: db/pokemon_tcg.db in the project root)')
+    parser.add_argument('--output', type=str, default=DEFAULT_STORE_PATH,
+                       help=f'Output store path (default: {DEFAULT_STORE_PATH})')
+    parser.add_argument('--widths', type=int, nargs='+', default=list(STANDARD_WIDTHS),
+                       help='Pixel widths to pre-render every card at')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    project_root = Path(__file__).parent.parent
+    db_path = args.db if args.db else project_root / 'db' / 'pokemon_tcg.db'
+    build_thumbnail_store(str(db_path), args.output, tuple(args.widths))
+
+
+if __name__ == "__main__":
+    main()
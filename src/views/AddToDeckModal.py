@@ -1,4 +1,3 @@
-import sqlite3
 from textual import on
 from textual.app import ComposeResult
 from textual.screen import ModalScreen
@@ -46,15 +45,13 @@ class AddToDeckModal(ModalScreen):
         Binding("o", "open_actions", "Actions", show=True),
     ]
     
-    def __init__(self, card_id, card_name, db_conn: sqlite3.Connection):
+    def __init__(self, card_id, card_name, decks: list[tuple]):
         super().__init__()
         self.card_id = card_id
         self.card_name = card_name
-        self.db_conn = db_conn
-        self.cursor = db_conn.cursor()
         self.deck_choice = "existing"  # Default to existing decks
         self.quantity = 1  # Default quantity
-        self.decks_data = self._get_decks_from_db()  # Store deck data for filtering
+        self.decks_data = decks  # (id, name) rows, loaded by the caller; kept for filtering
         self.all_decks = self._create_deck_list_items()  # Create list items from data
     
     def compose(self) -> ComposeResult:
@@ -95,11 +92,6 @@ class AddToDeckModal(ModalScreen):
             with Container(id="modal-buttons"):
                 yield Button("Cancel", variant="error", id="cancel-btn")
 
-    def _get_decks_from_db(self) -> list[tuple]:
-        """Get all decks from the database"""
-        decks = self.cursor.execute("SELECT id, name FROM decks ORDER BY name").fetchall()
-        return decks
-
     def _create_deck_list_items(self) -> list[ListItem]:
         """Create list items from deck data"""
         if not self.decks_data:
@@ -138,7 +130,7 @@ class AddToDeckModal(ModalScreen):
         self.dismiss()
     
     @on(Button.Pressed, "#create-deck-btn")
-    def on_create_deck(self) -> None:
+    async def on_create_deck(self) -> None:
         """Handle create deck button press"""
         deck_name_input = self.query_one("#new-deck-name", Input)
         deck_name = deck_name_input.value
@@ -147,23 +139,14 @@ class AddToDeckModal(ModalScreen):
             deck_name_input.focus()
             return
         
-        try:
-            # Insert the new deck
-            self.cursor.execute(
-                "INSERT INTO decks (name) VALUES (?)",
-                (deck_name,)  # Use the string value, not the Input widget
-            )
-            self.db_conn.commit()
-            
-            # Get the ID of the newly created deck
-            deck_id = self.cursor.lastrowid
-            quantity = int(self.query_one("#quantity-selector", Select).value)
-            
-            self.post_message(self.NewDeckCreated(deck_id, deck_name, quantity))
-            self.dismiss()
-        except sqlite3.Error as e:
-            # Handle error (in a real app, you'd want better error handling)
-            self.app.notify(f"Error creating deck: {str(e)}", severity="error")    
+        # Insert the new deck on the database thread; failures are reported there
+        deck_id = await self.app.card_management.create_empty_deck(deck_name)
+        if deck_id is None:
+            return
+        quantity = int(self.query_one("#quantity-selector", Select).value)
+        
+        self.post_message(self.NewDeckCreated(deck_id, deck_name, quantity))
+        self.dismiss()
 
     @on(Button.Pressed, "#cancel-btn")
     def on_cancel(self) -> None:
@@ -2,15 +2,16 @@ from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical, Grid, Container
 from textual.widgets import (
     Static,
-    ListView,
     Input,
     Select,
     RadioSet,
     RadioButton,
     Button,
+    Checkbox,
 )
 
 from views.PokemonCard import CardImage
+from views.VirtualCardList import VirtualCardList
 
 class BuilderView(Static):
     def compose(self) -> ComposeResult:
@@ -54,7 +55,7 @@ class BuilderView(Static):
                                 ("Electric", "electric"),
                                 ("Fighting", "fighting"),
                                 ("Psychic", "psychic"),
-                                ("Dark", "dark"),
+                                ("Dark", "darkness"),
                                 ("Metal", "metal"),
                                 ("Colorless", "colorless"),
                             ],
@@ -62,12 +63,49 @@ class BuilderView(Static):
                             value="all"
                         )
                         
+                        # Attack and retreat filters, answered from the moves table
+                        yield Static("Max attack cost:")
+                        yield Static("Min attack damage:")
+                        yield Static("Max retreat cost:")
+                        yield Static("")
+                        yield Input(placeholder="Any", type="integer", id="attack-cost-filter")
+                        yield Input(placeholder="Any", type="integer", id="damage-filter")
+                        yield Input(placeholder="Any", type="integer", id="retreat-filter")
+                        yield Static("")
+
+                        # HP and weakness filters, answered by the CardMatrix column store
+                        yield Static("Min HP:")
+                        yield Static("Max HP:")
+                        yield Static("Weakness:")
+                        yield Static("")
+                        yield Input(placeholder="Any", type="integer", id="min-hp-filter")
+                        yield Input(placeholder="Any", type="integer", id="max-hp-filter")
+                        yield Select(
+                            options=[
+                                ("Any", "all"),
+                                ("Grass", "grass"),
+                                ("Fire", "fire"),
+                                ("Water", "water"),
+                                ("Electric", "electric"),
+                                ("Psychic", "psychic"),
+                                ("Fighting", "fighting"),
+                                ("Dark", "darkness"),
+                                ("Metal", "metal"),
+                            ],
+                            id="weakness-filter",
+                            value="all"
+                        )
+                        yield Static("")
+
                         # Filter buttons
                         yield Button("Apply Filters", id="apply-filters", variant="primary")
                         yield Button("Clear Filters", id="clear-filters")
+
+                        # Search attacks and effect text as well as names
+                        yield Checkbox("Search card text", id="text-search")
                 
                 yield Static("Cards", id="builder-cards-title")
-                yield ListView(id="builder-cards-list")
+                yield VirtualCardList(id="builder-cards-list")
             
             # Column 2 - Card stats and image
             with Vertical(id="column-2"):
@@ -54,15 +54,15 @@ class CreateEmptyDeckModal(ModalScreen):
             id="modal-container",
         )
     
-    def on_button_pressed(self, event) -> None:
+    async def on_button_pressed(self, event) -> None:
         """Handle button press events."""
         button_id = event.button.id
         if button_id == "submit-btn":
-            self.action_submit()
+            await self.action_submit()
         elif button_id == "cancel-btn":
             self.action_cancel()
     
-    def action_submit(self) -> None:
+    async def action_submit(self) -> None:
         """Submit the form - either create a new deck or rename an existing one."""
         deck_name = self.query_one(Input).value
         
@@ -72,12 +72,12 @@ class CreateEmptyDeckModal(ModalScreen):
         
         if self.is_rename_mode:
             # Rename existing deck
-            self._app.card_management.rename_deck(self.deck_id, deck_name)
+            await self._app.card_management.rename_deck(self.deck_id, deck_name)
             self.dismiss(self.DeckCreated(self.deck_id, deck_name))
         else:
             # Create new deck
             try:
-                new_deck_id = self._app.card_management.create_empty_deck(deck_name)
+                new_deck_id = await self._app.card_management.create_empty_deck(deck_name)
                 if new_deck_id is None:
                     self._app.notify("Failed to create deck", severity="error")
                     return
@@ -89,7 +89,7 @@ class CreateEmptyDeckModal(ModalScreen):
         """Cancel the operation."""
         self.dismiss(self.Cancelled())
 
-    def action_rename_deck(self) -> None:
+    async def action_rename_deck(self) -> None:
         """Handle renaming the currently highlighted deck"""
         deck_selector = self._app.query_one("#decks-deck-selector")
         if deck_selector.index is None:
@@ -101,4 +101,4 @@ class CreateEmptyDeckModal(ModalScreen):
         self.deck_id = deck_item.deck_id
         self.deck_name = deck_item.query_one(Static).renderable
         
-        self._app.card_management.rename_deck(self.deck_id, self.deck_name)
+        await self._app.card_management.rename_deck(self.deck_id, self.deck_name)
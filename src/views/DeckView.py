@@ -2,10 +2,10 @@ from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical
 from textual.widgets import (
     Static,
-    ListView,
     Input,
 )
 from views.PokemonCard import CardImage
+from views.KeyedListView import KeyedListView
 
 class DeckView(Static):
     def compose(self) -> ComposeResult:
@@ -13,12 +13,12 @@ class DeckView(Static):
             yield Vertical(
                 Static("Decks"),
                 Input(placeholder="Search decks...", id="deck-view-search"),
-                ListView(id="decks-deck-selector"),
+                KeyedListView(id="decks-deck-selector", key_attr="deck_id"),
                 classes="column",
                 id="decks-column-1")
             yield Vertical(
                 Static("Card List"),
-                ListView(id="decks-cards-list"),
+                KeyedListView(id="decks-cards-list", key_attr="card_id"),
                 id="decks-column-2")
             yield Vertical(
                 Static("Card Stats"),
@@ -0,0 +1,88 @@
+from textual.widgets import ListView, ListItem, Static
+
+
+class KeyedListView(ListView):
+    """A ListView whose items are identified by a key and patched in place.
+
+    Each ListItem carries its key in the attribute named by key_attr (e.g.
+    "deck_id"), just like the items built by hand elsewhere. reconcile()
+    diffs the new rows against the mounted items, so only rows that were
+    inserted, removed, moved or relabelled touch the DOM.
+    """
+
+    def __init__(self, *args, key_attr: str = "key", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.key_attr = key_attr
+        self._labels = {}
+        self._pending = None
+        self._reconciling = False
+
+    @property
+    def highlighted_key(self):
+        return getattr(self.highlighted_child, self.key_attr, None)
+
+    def reconcile(self, rows, select_key=None) -> None:
+        """Show rows of (key, label) in order; only the latest pending request is applied.
+
+        The highlight stays on the same key when it is still listed, moves to
+        select_key when given, and otherwise falls back to the first row.
+        """
+        self._pending = (list(rows), select_key)
+        if not self._reconciling:
+            self._reconciling = True
+            self.run_worker(self._reconcile_pending(), group="reconcile")
+
+    async def _reconcile_pending(self) -> None:
+        try:
+            while self._pending is not None:
+                (rows, select_key), self._pending = self._pending, None
+                await self._apply(rows, select_key)
+        finally:
+            self._reconciling = False
+
+    def _make_item(self, key, label) -> ListItem:
+        item = ListItem(Static(label))
+        setattr(item, self.key_attr, key)
+        return item
+
+    async def _apply(self, rows, select_key) -> None:
+        items = {getattr(item, self.key_attr, None): item for item in self.query_children(ListItem)}
+        wanted = dict(rows)
+        highlighted_key = self.highlighted_key
+
+        stale = [item for key, item in items.items() if key not in wanted]
+        if stale:
+            await self.remove_children(stale)
+            for item in stale:
+                self._labels.pop(getattr(item, self.key_attr, None), None)
+
+        for position, (key, label) in enumerate(rows):
+            item = items.get(key)
+            if item is None:
+                item = self._make_item(key, label)
+                self._labels[key] = label
+                if position < len(self._nodes):
+                    await self.mount(item, before=position)
+                else:
+                    await self.mount(item)
+                continue
+
+            if self._labels.get(key) != label:
+                item.query_one(Static).update(label)
+                self._labels[key] = label
+            if self._nodes[position] is not item:
+                self.move_child(item, before=position)
+
+        target_key = select_key if select_key in wanted else highlighted_key
+        new_index = None
+        if rows:
+            new_index = next((i for i, (key, _) in enumerate(rows) if key == target_key), 0)
+
+        for position, item in enumerate(self._nodes):
+            item.highlighted = position == new_index
+
+        old_index = self.index
+        self.index = new_index
+        # The watcher only runs when the number changes, but the item under it may differ
+        if old_index == new_index and self.highlighted_key != highlighted_key:
+            self.watch_index(old_index, new_index)
@@ -1,13 +1,32 @@
 import os
+import threading
+from collections import OrderedDict
 from textual.widgets import (
     Static,
 )
 from rich_pixels import Pixels
 from PIL import Image
+from textual import work
 from textual.app import ComposeResult
+from textual.worker import get_current_worker
+from utils.thumbnail_store import default_thumbnail_store
 from textual.containers import Horizontal
 
+# Memory budget for rendered card images shared by every CardImage
+IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+# Rough size of one styled rich Segment produced by rich_pixels
+PIXEL_SEGMENT_BYTES = 200
+# Card images are rendered for the widget size rounded down to this many pixels
+IMAGE_SIZE_BUCKET = 8
+# Seconds to wait for resizing to stop before re-rendering a card image
+IMAGE_RESIZE_DEBOUNCE = 0.2
+
 class PokemonCard:
+    __slots__ = (
+        "id", "name", "set_name", "hp", "type", "image_path", "moves",
+        "weakness", "retreat_cost", "card_type", "description", "rule_text", "set_number",
+    )
+
     def __init__(self, id = None,
                  name = None,
                  set_name = None,
@@ -19,7 +38,8 @@ class PokemonCard:
                  retreat_cost = None,
                  card_type = None,
                  description = None,
-                 rule_text = None):
+                 rule_text = None,
+                 set_number = None):
         self.id = id
         self.name = name
         self.set_name = set_name
@@ -32,6 +52,7 @@ class PokemonCard:
         self.card_type = card_type
         self.description = description
         self.rule_text = rule_text
+        self.set_number = set_number
 
 class TypeIcon(Static):
     """A small widget to display a Pokémon type icon"""
@@ -70,10 +91,91 @@ class TypeIconDisplay(Horizontal):
         for type_name in self.type_names:
             yield TypeIcon(type_name)
 
+class ImageRenderCache:
+    """LRU cache of rendered card images, bounded by an approximate memory budget.
+
+    Entries are keyed by (image path, file mtime, target size), so an image
+    that is replaced on disk or rendered for a different size is a miss.
+    The cache is shared by every CardImage and may be filled from worker
+    threads.
+    """
+
+    def __init__(self, max_bytes: int = IMAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(image_path: str, target_size: tuple):
+        try:
+            mtime = os.stat(image_path).st_mtime_ns
+        except OSError:
+            return None
+        return (image_path, mtime, target_size)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, pixels, cost: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (pixels, cost)
+            self.total_bytes += cost
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_cost
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+def render_card_image(image_path: str, target_size: tuple, is_cancelled=lambda: False):
+    """Decode, resize and convert an image to Pixels; returns (pixels, approximate bytes).
+
+    is_cancelled is checked between the steps, and (None, 0) returned once it
+    is true, so a render nobody waits for any more stops early.
+    """
+    target_width, target_height = target_size
+    with Image.open(image_path) as image:
+        image.load()
+        if is_cancelled():
+            return None, 0
+        ratio = min(target_width / image.width, target_height / image.height)
+        new_size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+        image = image.resize(new_size, Image.Resampling.LANCZOS)
+        if is_cancelled():
+            return None, 0
+        pixels = Pixels.from_image(image)
+    # The half-cell renderer emits one segment per cell, two pixel rows per cell
+    cells = new_size[0] * (new_size[1] + 1) // 2
+    return pixels, cells * PIXEL_SEGMENT_BYTES
+
+
+card_image_cache = ImageRenderCache()
+
+
 class CardImage(Static):
-    def __init__(self, image_path: str | None = None, *args, **kwargs):
+    def __init__(self, image_path: str | None = None, *args, render_cache: ImageRenderCache | None = None,
+                 use_thumbnails: bool = True, **kwargs):
         super().__init__(*args, **kwargs)
         self.image_path = image_path
+        self.render_cache = render_cache or card_image_cache
+        self.thumbnail_store = default_thumbnail_store() if use_thumbnails else None
+        self.rendered_size = None
+        self.resize_timer = None
 
     def on_mount(self) -> None:
         try:
@@ -81,25 +183,117 @@ class CardImage(Static):
         except Exception:
             self.update("Error loading image")
 
+    def target_size(self) -> tuple:
+        """The content region in pixels, rounded down to a size bucket.
+
+        The half-cell renderer draws two pixel rows per terminal row. Rounding
+        to IMAGE_SIZE_BUCKET means small resizes reuse the same cached render.
+        """
+        width, height = self.content_size
+        return (
+            max(IMAGE_SIZE_BUCKET, width // IMAGE_SIZE_BUCKET * IMAGE_SIZE_BUCKET),
+            max(IMAGE_SIZE_BUCKET, height * 2 // IMAGE_SIZE_BUCKET * IMAGE_SIZE_BUCKET),
+        )
+
+    def on_resize(self) -> None:
+        if self.resize_timer is not None:
+            self.resize_timer.stop()
+        self.resize_timer = self.set_timer(IMAGE_RESIZE_DEBOUNCE, self.rerender_for_size)
+
+    def rerender_for_size(self) -> None:
+        self.resize_timer = None
+        if self.image_path and self.target_size() != self.rendered_size:
+            self.update_image(self.image_path)
+
+    def render_pixels(self, image_path: str, target_size: tuple, is_cancelled=lambda: False):
+        """Return the rendered image for a path and size, rendering it on a cache miss.
+
+        Returns None if is_cancelled became true before a render finished.
+        """
+        key = self.render_cache.key_for(image_path, target_size)
+        if key is None:
+            return None
+        pixels = self.render_cache.get(key)
+        if pixels is None:
+            pixels, cost = render_card_image(image_path, target_size, is_cancelled)
+            if pixels is not None:
+                self.render_cache.put(key, pixels, cost)
+        return pixels
+
+    def thumbnail_pixels(self, image_path: str, target_size: tuple):
+        """Return an image's pre-rendered thumbnail for this size, or None if the store lacks it."""
+        if self.thumbnail_store is None:
+            return None
+        variant = self.thumbnail_store.variant_for(image_path, target_size)
+        if variant is None:
+            return None
+        key = ("thumbnail", image_path, variant[0], variant[1])
+        pixels = self.render_cache.get(key)
+        if pixels is None:
+            pixels = Pixels.from_image(self.thumbnail_store.image(variant))
+            self.render_cache.put(key, pixels, variant[0] * (variant[1] + 1) // 2 * PIXEL_SEGMENT_BYTES)
+        return pixels
+
     def update_image(self, image_path: str | None) -> None:
+        """Show an image, rendering it on a worker thread when it is not cached yet."""
+        self.image_path = image_path
         try:
-            if image_path and os.path.exists(image_path):
-                with Image.open(image_path) as image:
-                    terminal_size = os.get_terminal_size()
-                    terminal_width = terminal_size.columns
-                    terminal_height = terminal_size.lines
+            target_size = self.target_size()
+            self.rendered_size = target_size
+            pixels = self.thumbnail_pixels(image_path, target_size) if image_path else None
+            if pixels is not None:
+                self.update(pixels)
+                return
 
-                    ratio = min(
-                        terminal_width / image.width, terminal_height / image.height
-                    )
-                    new_size = (int(image.width * ratio), int(image.height * ratio))
-                    image = image.resize(new_size, Image.Resampling.LANCZOS)
+            key = self.render_cache.key_for(image_path, target_size) if image_path else None
+            if key is None:
+                self.update("No image available")
+                return
 
-                    pixels = Pixels.from_image(image)
+            pixels = self.render_cache.get(key)
+            if pixels is not None:
+                self.update(pixels)
+                return
 
-                    self.update(pixels)
-            else:
-                self.update("No image available")
+            self.update("Loading image...")
+            self.render_in_background(image_path, target_size)
         except Exception:
             self.update("Error updating image")
 
+    @work(thread=True, exclusive=True, group="card-image-render")
+    def render_in_background(self, image_path: str, target_size: tuple) -> None:
+        """Decode and resize off the event loop; starting a new render cancels this one.
+
+        The worker is checked between decoding and resizing, so scrolling
+        through cards does not finish a full-size render for each one passed.
+        """
+        worker = get_current_worker()
+        if worker.is_cancelled:
+            return
+        try:
+            pixels = self.render_pixels(image_path, target_size, lambda: worker.is_cancelled)
+        except Exception:
+            pixels = None
+        if not worker.is_cancelled:
+            try:
+                self.app.call_from_thread(self.show_rendered, image_path, pixels)
+            except RuntimeError:
+                # The app stopped while the image was rendering
+                pass
+
+    def show_rendered(self, image_path: str, pixels) -> None:
+        # The user may have moved on while this image was rendering
+        if image_path != self.image_path:
+            return
+        self.update(pixels if pixels is not None else "Error updating image")
+
+    def prefetch(self, image_paths, target_size: tuple, is_cancelled=lambda: False) -> None:
+        """Render images into the cache ahead of time; safe from a worker thread."""
+        for image_path in image_paths:
+            if is_cancelled():
+                return
+            try:
+                if image_path and self.thumbnail_pixels(image_path, target_size) is None:
+                    self.render_pixels(image_path, target_size, is_cancelled)
+            except Exception:
+                continue
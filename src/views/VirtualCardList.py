@@ -0,0 +1,180 @@
+from rich.segment import Segment
+from textual import events
+from textual.binding import Binding
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+class VirtualCardList(ScrollView, can_focus=True):
+    """A scrollable card list that only renders the rows inside the viewport.
+
+    Rows are plain (card_id, label) tuples rather than mounted ListItems, so
+    replacing the contents costs the same for ten cards or fifty thousand.
+    """
+
+    COMPONENT_CLASSES = {"virtual-card-list--cursor"}
+
+    DEFAULT_CSS = """
+    VirtualCardList {
+        background: $surface;
+        & > .virtual-card-list--cursor {
+            color: $block-cursor-blurred-foreground;
+            background: $block-cursor-blurred-background;
+            text-style: $block-cursor-blurred-text-style;
+        }
+
+        &:focus {
+            background-tint: $foreground 5%;
+            & > .virtual-card-list--cursor {
+                color: $block-cursor-foreground;
+                background: $block-cursor-background;
+                text-style: $block-cursor-text-style;
+            }
+        }
+    }
+    """
+
+    BINDINGS = [
+        Binding("enter", "select_cursor", "Select", show=False),
+        Binding("up", "cursor_up", "Cursor up", show=False),
+        Binding("down", "cursor_down", "Cursor down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+    ]
+
+    index = reactive(None, always_update=True)
+
+    class Highlighted(Message):
+        """Message sent when the cursor moves onto a card."""
+        def __init__(self, card_list, card_id) -> None:
+            super().__init__()
+            self.card_list = card_list
+            self.card_id = card_id
+
+        @property
+        def control(self):
+            return self.card_list
+
+    class Selected(Message):
+        """Message sent when a card is selected with enter or a click."""
+        def __init__(self, card_list, card_id) -> None:
+            super().__init__()
+            self.card_list = card_list
+            self.card_id = card_id
+
+        @property
+        def control(self):
+            return self.card_list
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rows = []
+        self._row_index = {}
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    @property
+    def highlighted_card_id(self):
+        if self.index is None:
+            return None
+        return self._rows[self.index][0]
+
+    def card_id_at(self, index):
+        """Return the card id at a row index, or None when out of range."""
+        if index is None or not 0 <= index < len(self._rows):
+            return None
+        return self._rows[index][0]
+
+    def index_of(self, card_id):
+        """Return the row index for a card id, or None if it is not listed."""
+        return self._row_index.get(card_id)
+
+    def set_rows(self, rows) -> None:
+        """Replace the rows, keeping the cursor on the same card if it is still present."""
+        previous_card_id = self.highlighted_card_id
+        self._rows = list(rows)
+        self._row_index = {card_id: i for i, (card_id, _) in enumerate(self._rows)}
+        self.virtual_size = Size(0, len(self._rows))
+
+        if not self._rows:
+            self.index = None
+        else:
+            self.index = self._row_index.get(previous_card_id, 0)
+        self.refresh()
+
+    def clear(self) -> None:
+        self.set_rows([])
+
+    def validate_index(self, index):
+        if index is None or not self._rows:
+            return None
+        return max(0, min(index, len(self._rows) - 1))
+
+    def watch_index(self, old_index, new_index) -> None:
+        self.refresh()
+        if new_index is None:
+            return
+        self.scroll_to_region(Region(0, new_index, 1, 1), animate=False, x_axis=False)
+        self.post_message(self.Highlighted(self, self._rows[new_index][0]))
+
+    def _move_cursor(self, index) -> None:
+        if not self._rows:
+            return
+        index = self.validate_index(index)
+        if index != self.index:
+            self.index = index
+
+    def action_cursor_up(self) -> None:
+        self._move_cursor(0 if self.index is None else self.index - 1)
+
+    def action_cursor_down(self) -> None:
+        self._move_cursor(0 if self.index is None else self.index + 1)
+
+    def action_page_up(self) -> None:
+        page = max(1, self.scrollable_content_region.height)
+        self._move_cursor(0 if self.index is None else self.index - page)
+
+    def action_page_down(self) -> None:
+        page = max(1, self.scrollable_content_region.height)
+        self._move_cursor(0 if self.index is None else self.index + page)
+
+    def action_first(self) -> None:
+        self._move_cursor(0)
+
+    def action_last(self) -> None:
+        self._move_cursor(len(self._rows) - 1)
+
+    def action_select_cursor(self) -> None:
+        if self.index is not None:
+            self.post_message(self.Selected(self, self._rows[self.index][0]))
+
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        row = self.scroll_offset.y + offset.y
+        if 0 <= row < len(self._rows):
+            self._move_cursor(row)
+            self.post_message(self.Selected(self, self._rows[row][0]))
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        row = scroll_y + y
+        width = self.size.width
+        style = self.rich_style
+
+        if row >= len(self._rows):
+            return Strip.blank(width, style)
+
+        if row == self.index:
+            style = self.get_component_rich_style("virtual-card-list--cursor")
+
+        _, label = self._rows[row]
+        return Strip([Segment(label, style)]).crop_extend(scroll_x, scroll_x + width, style)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app runs from src/ (python src/main.py), so its modules import as utils.* and views.*
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -0,0 +1,33 @@
+import json
+import sqlite3
+
+from utils.card_functions.card_catalog import CardCatalog
+from utils.import_cards import bump_catalog_version, import_cards_from_json
+
+
+def test_catalog_stays_current_until_the_cards_change(tmp_path):
+    json_file = tmp_path / "cards.json"
+    json_file.write_text(json.dumps([{"set_name": "geneticapex", "set_number": "1", "name": "Bulbasaur"}]))
+    db_path = str(tmp_path / "cards.db")
+    import_cards_from_json(str(json_file), db_path)
+    reader = sqlite3.connect(db_path)
+    writer = sqlite3.connect(db_path)
+
+    catalog = CardCatalog.load(reader)
+    assert catalog.current_data_version(reader) == catalog.data_version
+
+    # A deck edit moves the data version but not the catalog version
+    with writer:
+        writer.execute("INSERT INTO decks (name) VALUES ('Grass')")
+    checked = catalog.current_data_version(reader)
+    assert checked is not None and checked != catalog.data_version
+    assert catalog.current_data_version(reader, checked) == checked
+
+    with writer:
+        bump_catalog_version(writer.cursor())
+    assert catalog.current_data_version(reader, checked) is None
+    # The snapshot itself was never changed
+    assert catalog.current_data_version(reader) is None
+
+    reader.close()
+    writer.close()
@@ -0,0 +1,39 @@
+from PIL import Image
+from rich_pixels import Pixels
+
+from views.PokemonCard import PIXEL_SEGMENT_BYTES, render_card_image
+
+
+def card_image(tmp_path):
+    path = tmp_path / "card.png"
+    Image.new("RGB", (60, 84), "green").save(path)
+    return str(path)
+
+
+def test_render_fits_the_target_size(tmp_path, monkeypatch):
+    sizes = []
+    from_image = Pixels.from_image
+    monkeypatch.setattr(Pixels, "from_image", lambda image: sizes.append(image.size) or from_image(image))
+
+    pixels, cost = render_card_image(card_image(tmp_path), (30, 30))
+    assert pixels is not None
+    # 60x84 scaled by 30/84 to fit the height, keeping the 5:7 aspect ratio
+    assert sizes == [(21, 30)]
+    assert cost == 21 * 31 // 2 * PIXEL_SEGMENT_BYTES
+
+    sizes.clear()
+    render_card_image(card_image(tmp_path), (30, 120))
+    # Limited by the width this time
+    assert sizes == [(30, 42)]
+
+
+def test_cancelled_render_stops_between_steps(tmp_path):
+    checks = []
+
+    def is_cancelled():
+        checks.append(len(checks))
+        return len(checks) > 1
+
+    # Decoded, then cancelled once resized, before the conversion to Pixels
+    assert render_card_image(card_image(tmp_path), (30, 30), is_cancelled) == (None, 0)
+    assert checks == [0, 1]
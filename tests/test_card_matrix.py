@@ -0,0 +1,88 @@
+import itertools
+import json
+import sqlite3
+
+import pytest
+
+from utils.card_functions.card_management import card_filter_query
+from utils.card_functions.card_matrix import CardMatrix
+from utils.import_cards import import_cards_from_json
+
+
+def card(set_number, moves, card_type="Pokémon", pokemon_type="grass", hp=70, weakness=(), retreat=0):
+    return {"set_name": "geneticapex", "set_number": set_number, "name": f"Card {set_number}", "hp": hp,
+            "type": pokemon_type, "card_type": card_type, "weakness": list(weakness),
+            "retreat_cost": ["colorless"] * retreat,
+            "moves": [{"name": name, "energy_cost": ["grass"] * cost, "description": "", "damage": damage}
+                      for name, cost, damage in moves]}
+
+
+CARDS = [
+    card("1", [("Growl", 1, "")], hp=40, weakness=["fire"], retreat=1),
+    card("2", [("Tackle", 1, "10"), ("Sleep Powder", 0, "")], hp=90, weakness=["fire"], retreat=2),
+    card("3", [("Razor Leaf", 2, "60")], pokemon_type="fire", hp=150, weakness=["water"], retreat=3),
+    card("4", [("Nuzzle", 0, "0")], hp=60, weakness=["fighting"]),
+    card("5", [], card_type="Trainer - Item", pokemon_type=None, hp=None),
+]
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("matrix")
+    json_file = tmp_path / "cards.json"
+    json_file.write_text(json.dumps(CARDS))
+    db_path = str(tmp_path / "cards.db")
+    import_cards_from_json(str(json_file), db_path)
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def matrix(conn):
+    return CardMatrix.load(conn)
+
+
+def set_numbers(conn, matrix, filters):
+    card_ids = json.dumps(matrix.card_ids(filters).tolist())
+    return sorted(row[0] for row in conn.execute(
+        "SELECT set_number FROM cards WHERE id IN (SELECT value FROM json_each(?))", (card_ids,)
+    ))
+
+
+SQL_FILTERS = [
+    dict(zip(("category", "pokemon_type", "max_attack_cost", "min_damage", "max_retreat"), values))
+    for values in itertools.product(("all", "pokemon", "trainer"), ("all", "fire"), (None, 0, 1, 2),
+                                    (None, 0, 10, 60), (None, 0, 2))
+]
+
+
+@pytest.mark.parametrize("filters", SQL_FILTERS, ids=str)
+def test_matrix_matches_sql(conn, matrix, filters):
+    sql, params = card_filter_query(filters)
+    expected = {row[0] for row in conn.execute(sql, params)} if sql else set(matrix.ids.tolist())
+    assert set(matrix.card_ids(filters).tolist()) == expected
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"min_hp": 60}, ["2", "3", "4"]),
+    ({"min_hp": 0}, ["1", "2", "3", "4"]),
+    # A card without HP has none to be under a limit either
+    ({"max_hp": 60}, ["1", "4"]),
+    ({"min_hp": 50, "max_hp": 100}, ["2", "4"]),
+    ({"min_hp": 200}, []),
+    ({"weakness": "fire"}, ["1", "2"]),
+    ({"weakness": "water"}, ["3"]),
+    ({"weakness": "grass"}, []),
+    ({"weakness": "all"}, ["1", "2", "3", "4", "5"]),
+    ({"max_retreat": 1}, ["1", "4", "5"]),
+    ({"weakness": "fire", "min_hp": 60}, ["2"]),
+    ({"weakness": "fire", "max_retreat": 1}, ["1"]),
+    ({"max_hp": 100, "max_retreat": 0}, ["4"]),
+    ({"min_hp": 50, "min_damage": 10}, ["2", "3"]),
+    ({"max_hp": 100, "max_attack_cost": 0}, ["2", "4"]),
+    ({"min_hp": 50, "category": "pokemon", "pokemon_type": "grass", "weakness": "fighting"}, ["4"]),
+    ({"min_hp": 50, "set": "mythicalisland"}, []),
+])
+def test_hp_weakness_and_retreat_filters(conn, matrix, filters, expected):
+    assert set_numbers(conn, matrix, filters) == expected
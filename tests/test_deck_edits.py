@@ -0,0 +1,95 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from utils.async_db import AsyncDatabase
+from utils.card_functions.card_management import CardManagement
+from utils.db_connection import ConnectionFactory
+from utils.import_cards import import_cards_from_json
+
+
+class RecordingApp:
+    """Stands in for the Textual app: edit_deck only notifies and updates the status line"""
+
+    def __init__(self):
+        self.notices = []
+
+    def notify(self, message, severity="information"):
+        self.notices.append((severity, message))
+
+    def query_one(self, selector, expect_type=None):
+        return self
+
+    def update(self, renderable):
+        pass
+
+
+def card(set_number, name):
+    return {"set_name": "geneticapex", "set_number": set_number, "name": name, "hp": 70, "type": "grass",
+            "moves": [], "weakness": [], "retreat_cost": []}
+
+
+@pytest.fixture
+def db_path(tmp_path, capsys):
+    json_file = tmp_path / "cards.json"
+    json_file.write_text(json.dumps([card("1", "Bulbasaur"), card("2", "Ivysaur"), card("230", "Bulbasaur")]))
+    db_path = str(tmp_path / "cards.db")
+    import_cards_from_json(str(json_file), db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO decks (id, name) VALUES (1, 'Grass')")
+    conn.close()
+    capsys.readouterr()
+    return db_path
+
+
+def edit(db_path, edits):
+    """Apply edits to deck 1; return whether they were applied, the notices and the deck's counts"""
+    async def run():
+        db = AsyncDatabase(ConnectionFactory(db_path))
+        app = RecordingApp()
+        try:
+            applied = await CardManagement(db, app).edit_deck(1, "Grass", edits)
+        finally:
+            db.close()
+        return applied, app.notices
+
+    applied, notices = asyncio.run(run())
+    conn = sqlite3.connect(db_path)
+    counts = dict(conn.execute("SELECT card_id, count FROM deck_cards WHERE deck_id = 1"))
+    conn.close()
+    return applied, notices, counts
+
+
+def test_edits_are_folded_into_new_counts(db_path):
+    assert edit(db_path, [("add", 1, 2), ("remove", 1, 1), ("set", 2, 2)]) == (True, [], {1: 1, 2: 2})
+
+
+def test_copies_of_one_name_count_together(db_path):
+    edit(db_path, [("add", 1, 2)])
+    applied, notices, counts = edit(db_path, [("add", 3, 1)])
+    assert not applied
+    assert notices == [("warning", "Deck 'Grass' would exceed 2 copies of Bulbasaur.")]
+    assert counts == {1: 2}
+
+
+def test_unknown_action_is_reported_without_writing(db_path):
+    applied, notices, counts = edit(db_path, [("add", 1, 1), ("double", 2, 1)])
+    assert not applied
+    assert notices == [("error", "Unknown deck edit: double")]
+    assert counts == {}
+
+
+def test_card_gone_from_the_catalog_can_be_removed_but_not_added(db_path):
+    edit(db_path, [("add", 2, 2)])
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM cards WHERE id = 2")
+    conn.close()
+
+    applied, notices, counts = edit(db_path, [("add", 2, 1)])
+    assert (applied, notices, counts) == (False, [("warning", "Card 2 is not in the catalog.")], {2: 2})
+    assert edit(db_path, [("remove", 2, 1)]) == (True, [], {2: 1})
+    assert edit(db_path, [("set", 2, 0)]) == (True, [], {})
@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from utils import import_cards
+from utils.import_cards import (bulk_import_cards, bump_catalog_version, create_card_tables, ensure_search_index,
+                                import_cards_from_json, prepared_card_batches)
+
+
+def make_card(set_number, name="Bulbasaur", damage="40", set_name="geneticapex"):
+    return {
+        "set_name": set_name,
+        "set_number": set_number,
+        "name": name,
+        "hp": 70,
+        "type": "grass",
+        "moves": [{"name": "Vine Whip", "energy_cost": ["grass", "colorless"], "description": "", "damage": damage}],
+        "weakness": ["fire"],
+        "weakness_damage": "+20",
+        "retreat_cost": ["colorless"],
+    }
+
+
+def write_cards(path, cards):
+    path.write_text(json.dumps(cards))
+    return str(path)
+
+
+def rows(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def card_ids(db_path):
+    return dict(rows(db_path, "SELECT set_number, id FROM cards"))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cards.db")
+
+
+def test_reimport_counts_unchanged_cards(tmp_path, db_path, capsys):
+    cards = write_cards(tmp_path / "cards.json", [make_card("1"), make_card("2", name="Ivysaur")])
+    import_cards_from_json(cards, db_path)
+    assert "2 cards added, 0 changed, 0 unchanged" in capsys.readouterr().out
+
+    import_cards_from_json(cards, db_path)
+    assert "0 cards added, 0 changed, 2 unchanged" in capsys.readouterr().out
+
+
+def test_changed_card_is_updated_in_place(tmp_path, db_path, capsys):
+    import_cards_from_json(write_cards(tmp_path / "old.json", [make_card("1"), make_card("2")]), db_path)
+    ids = card_ids(db_path)
+
+    changed = write_cards(tmp_path / "new.json", [make_card("1", name="Bulbasaurus", damage="50"), make_card("2")])
+    import_cards_from_json(changed, db_path)
+    assert "0 cards added, 1 changed, 1 unchanged" in capsys.readouterr().out
+
+    assert card_ids(db_path) == ids
+    card_id = ids["1"]
+    assert rows(db_path, "SELECT name FROM cards WHERE id = ?", (card_id,)) == [("Bulbasaurus",)]
+    assert rows(db_path, "SELECT damage FROM moves WHERE card_id = ?", (card_id,)) == [(50,)]
+    assert rows(db_path, "SELECT name FROM cards_fts WHERE rowid = ?", (card_id,)) == [("Bulbasaurus",)]
+
+    import_cards_from_json(changed, db_path)
+    assert "0 cards added, 0 changed, 2 unchanged" in capsys.readouterr().out
+
+
+def test_alternate_printings_are_kept(tmp_path, db_path):
+    import_cards_from_json(write_cards(tmp_path / "cards.json", [make_card("1"), make_card("230")]), db_path)
+    assert rows(db_path, "SELECT count(*) FROM cards WHERE name = 'Bulbasaur'") == [(2,)]
+
+
+def test_cards_without_a_number_are_kept_apart(tmp_path, db_path, capsys):
+    promos = write_cards(tmp_path / "promos.json", [
+        make_card("Promo A", name=name, set_name="promo-a") for name in ("Pikachu", "Mewtwo", "Chansey")
+    ])
+    import_cards_from_json(promos, db_path)
+    assert "3 cards added" in capsys.readouterr().out
+    assert sorted(rows(db_path, "SELECT set_number FROM cards")) == [
+        ("Promo A Chansey",), ("Promo A Mewtwo",), ("Promo A Pikachu",)
+    ]
+
+    import_cards_from_json(promos, db_path)
+    assert "0 cards added, 0 changed, 3 unchanged" in capsys.readouterr().out
+
+
+def test_schema_6_keys_older_numberless_cards_as_an_import_would(tmp_path, db_path, capsys):
+    promos = write_cards(tmp_path / "promos.json", [
+        make_card("Promo A", name=name, set_name="promo-a") for name in ("Pikachu", "Mewtwo", "Mewtwo")
+    ])
+    import_cards_from_json(promos, db_path)
+    ids = card_ids(db_path)
+
+    # As stored before schema 6, keyed by name: every card has the set's name as its number
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DROP INDEX idx_cards_set_number")
+        conn.execute("UPDATE cards SET set_number = 'Promo A'")
+        conn.execute("PRAGMA user_version = 5")
+    create_card_tables(conn)
+    conn.close()
+    capsys.readouterr()
+
+    assert card_ids(db_path) == ids
+    import_cards_from_json(promos, db_path)
+    assert "0 cards added, 0 changed, 2 unchanged" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("importer", ["single", "bulk"])
+def test_repeated_cards_keep_the_first(tmp_path, db_path, capsys, importer):
+    cards = write_cards(tmp_path / "cards.json", [
+        make_card("1"),
+        make_card("1"),
+        make_card("1", name="Ivysaur"),
+        {"set_name": "geneticapex", "set_number": "3"},
+    ])
+    if importer == "bulk":
+        bulk_import_cards([cards], db_path, batch_size=2)
+    else:
+        import_cards_from_json(cards, db_path)
+    out = capsys.readouterr().out
+
+    assert "Skipped 1 records that are not cards" in out
+    assert "Collapsed 1 duplicate cards" in out
+    assert "Skipped 1 cards whose set number was already imported" in out
+    assert rows(db_path, "SELECT name FROM cards") == [("Bulbasaur",)]
+
+
+def test_force_reimport_restores_deck_cards(tmp_path, db_path, capsys):
+    import_cards_from_json(write_cards(tmp_path / "old.json", [make_card("1"), make_card("2", name="Ivysaur")]), db_path)
+    ids = card_ids(db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO decks (id, name) VALUES (1, 'Grass')")
+        conn.executemany("INSERT INTO deck_cards (deck_id, card_id, count) VALUES (1, ?, ?)",
+                         [(ids["1"], 2), (ids["2"], 1)])
+    conn.close()
+
+    # The re-imported cards come in another order, so they get other ids
+    reordered = [make_card("3", name="Venusaur"), make_card("2", name="Ivysaur"), make_card("1")]
+    import_cards_from_json(write_cards(tmp_path / "new.json", reordered), db_path, force_recreate=True)
+    capsys.readouterr()
+
+    assert card_ids(db_path) != ids
+    assert sorted(rows(db_path, """
+        SELECT c.set_number, dc.count FROM deck_cards dc JOIN cards c ON c.id = dc.card_id
+    """)) == [("1", 2), ("2", 1)]
+    assert sorted(rows(db_path, "SELECT card_name, count FROM deck_name_counts")) == [("Bulbasaur", 2), ("Ivysaur", 1)]
+
+
+def test_force_reimport_removes_deck_cards_that_are_gone(tmp_path, db_path, capsys):
+    import_cards_from_json(write_cards(tmp_path / "old.json", [make_card("1"), make_card("2", name="Ivysaur")]), db_path)
+    ids = card_ids(db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO decks (id, name) VALUES (1, 'Grass')")
+        conn.executemany("INSERT INTO deck_cards (deck_id, card_id, count) VALUES (1, ?, 1)", [(ids["1"],), (ids["2"],)])
+    conn.close()
+
+    import_cards_from_json(write_cards(tmp_path / "new.json", [make_card("2", name="Ivysaur")]), db_path,
+                           force_recreate=True)
+    assert "Removed 1 deck cards" in capsys.readouterr().out
+
+    assert rows(db_path, """
+        SELECT c.set_number, dc.count FROM deck_cards dc JOIN cards c ON c.id = dc.card_id
+    """) == [("2", 1)]
+    assert rows(db_path, "SELECT total FROM deck_totals WHERE deck_id = 1") == [(1,)]
+
+
+def test_search_index_is_current_after_an_import(tmp_path, db_path):
+    import_cards_from_json(write_cards(tmp_path / "old.json", [make_card("1"), make_card("2")]), db_path)
+    import_cards_from_json(write_cards(tmp_path / "new.json", [make_card("1", name="Bulbasaurus")]), db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM cards_fts WHERE name = 'Bulbasaur'")
+    ensure_search_index(conn)
+    # Not rebuilt, so the deleted row stays deleted
+    assert conn.execute("SELECT name FROM cards_fts").fetchall() == [("Bulbasaurus",)]
+    conn.close()
+
+
+def test_search_index_is_rebuilt_after_another_writer_changes_cards(tmp_path, db_path):
+    import_cards_from_json(write_cards(tmp_path / "cards.json", [make_card("1"), make_card("2")]), db_path)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE cards SET name = 'Bulbasaurus' WHERE set_number = '1'")
+        bump_catalog_version(conn.cursor())
+    ensure_search_index(conn)
+    assert sorted(conn.execute("SELECT name FROM cards_fts").fetchall()) == [("Bulbasaur",), ("Bulbasaurus",)]
+    conn.close()
+
+
+def test_workers_prepare_every_file_in_order(tmp_path):
+    files = [write_cards(tmp_path / f"cards{i}.json", [make_card(str(i * 10 + n)) for n in range(3)]) for i in range(3)]
+    batches = list(prepared_card_batches(files, batch_size=2, workers=2))
+    assert [row[2] for batch in batches for row, *rest in batch] == list(map(str, [0, 1, 2, 10, 11, 12, 20, 21, 22]))
+
+
+def _die(tasks, results, batch_size):
+    os._exit(3)
+
+
+def test_dead_worker_fails_the_import(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_cards, "_prepare_files", _die)
+    monkeypatch.setattr(import_cards, "PIPELINE_POLL_SECONDS", 0.1)
+    files = [write_cards(tmp_path / f"cards{i}.json", [make_card("1")]) for i in range(2)]
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        list(prepared_card_batches(files, workers=2))
+
+
+def run_import(cwd, *args):
+    script = Path(__file__).parent.parent / "src" / "utils" / "import_cards.py"
+    return subprocess.run([sys.executable, str(script), *args], cwd=cwd, capture_output=True, text=True)
+
+
+def test_cli_imports_into_a_bare_db_filename(tmp_path):
+    write_cards(tmp_path / "cards.json", [make_card("1")])
+    result = run_import(tmp_path, "--input", "cards.json", "--db", "cards.db")
+    assert result.returncode == 0, result.stderr
+    assert rows(str(tmp_path / "cards.db"), "SELECT count(*) FROM cards") == [(1,)]
+
+
+@pytest.mark.parametrize("bulk", [[], ["--bulk"]])
+def test_cli_exits_nonzero_when_the_import_fails(tmp_path, bulk):
+    (tmp_path / "cards.ndjson").write_text(json.dumps(make_card("1")) + "\n{not json\n")
+    result = run_import(tmp_path, *bulk, "--input", "cards.ndjson", "--db", "cards.db")
+    assert result.returncode != 0
+    assert "cards.ndjson:2" in result.stdout
@@ -0,0 +1,61 @@
+import asyncio
+
+from textual.app import App
+from textual.widgets import ListItem, Static
+
+from views.KeyedListView import KeyedListView
+
+
+class ListApp(App):
+    def compose(self):
+        yield KeyedListView(id="decks", key_attr="deck_id")
+
+
+def shown(view):
+    """The (key, label) of every mounted item, in order"""
+    return [(item.deck_id, str(item.query_one(Static).renderable)) for item in view.query_children(ListItem)]
+
+
+def test_reconcile_patches_items_in_place():
+    async def run():
+        app = ListApp()
+        async with app.run_test() as pilot:
+            view = app.query_one(KeyedListView)
+
+            async def reconcile(rows, select_key=None):
+                view.reconcile(rows, select_key)
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+
+            await reconcile([(1, "Fire"), (2, "Grass"), (3, "Water")])
+            assert shown(view) == [(1, "Fire"), (2, "Grass"), (3, "Water")]
+            assert view.highlighted_key == 1
+            await reconcile([(1, "Fire"), (2, "Grass"), (3, "Water")], select_key=2)
+            assert view.highlighted_key == 2
+            items = {item.deck_id: item for item in view.query_children(ListItem)}
+
+            # Insert 4, remove 1, move 3 to the front and relabel 2
+            await reconcile([(3, "Water"), (4, "Lightning"), (2, "Grass and Psychic")])
+            assert shown(view) == [(3, "Water"), (4, "Lightning"), (2, "Grass and Psychic")]
+            # Kept keys keep their widgets, so only the changes touched the DOM
+            assert view.query_children(ListItem)[0] is items[3]
+            assert view.query_children(ListItem)[2] is items[2]
+            # The highlight follows its key to the new position
+            assert view.highlighted_key == 2
+            assert view.index == 2
+            assert [item.highlighted for item in view.query_children(ListItem)] == [False, False, True]
+
+            # With the highlighted key gone it falls back to the first row
+            await reconcile([(4, "Lightning"), (3, "Water")])
+            assert view.highlighted_key == 4
+
+            # A request made while another is pending replaces it
+            view.reconcile([(5, "Metal")])
+            await reconcile([(6, "Darkness"), (3, "Water")])
+            assert shown(view) == [(6, "Darkness"), (3, "Water")]
+
+            await reconcile([])
+            assert shown(view) == []
+            assert view.highlighted_key is None
+
+    asyncio.run(run())
@@ -0,0 +1,70 @@
+import pytest
+
+from utils.card_functions.name_index import CardNameIndex, card_label
+
+# (card_id, name, set_name, set_number) in display order: by set, then name
+ROWS = [
+    (12, "Bulbasaur", "geneticapex", "Genetic Apex 1/226"),
+    (40, "Bulbasaur", "geneticapex", "Genetic Apex 227/226"),
+    (7, "Ivysaur", "geneticapex", "Genetic Apex 2/226"),
+    (3, "Mr. Mime", "geneticapex", "Genetic Apex 3/226"),
+    (90, "Abcd", "mythicalisland", "Mythical Island 1/86"),
+    (91, "Bcde", "mythicalisland", "Mythical Island 2/86"),
+    (55, "Venusaur", "promo-a", "Promo A Venusaur"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CardNameIndex(ROWS)
+
+
+def found(index, text):
+    return [index.card_ids[ordinal] for ordinal in index.search(text)]
+
+
+def test_empty_query_lists_every_card(index):
+    assert found(index, "") == [row[0] for row in ROWS]
+    assert found(index, None) == [row[0] for row in ROWS]
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Shorter than GRAM_SIZE
+    ("v", [7, 55]),
+    ("au", [12, 40, 7, 55]),
+    # As long as GRAM_SIZE
+    ("aur", [12, 40, 7, 55]),
+    ("bcd", [90, 91]),
+    # Longer than GRAM_SIZE
+    ("saur", [12, 40, 7, 55]),
+    ("bulbasaur", [12, 40]),
+    ("mr. m", [3]),
+])
+def test_substring_matches_come_back_in_display_order(index, text, expected):
+    assert found(index, text) == expected
+
+
+@pytest.mark.parametrize("text", ["BULBA", "bUlBaSaUr", "MR. MIME"])
+def test_case_is_folded(index, text):
+    assert found(index, text) == found(index, text.lower())
+    assert found(index, text)
+
+
+@pytest.mark.parametrize("text", ["x", "zz", "qqq", "bulbasaurs", "abcde"])
+def test_no_match(index, text):
+    # "abcde": every gram is in some name, but no name holds them all
+    assert found(index, text) == []
+
+
+def test_cards_are_found_by_id(index):
+    assert [index.ordinals[card_id] for card_id, *rest in ROWS] == list(range(len(ROWS)))
+    assert len(index) == len(ROWS)
+
+
+@pytest.mark.parametrize("row, expected", [
+    (ROWS[1], "Bulbasaur (geneticapex 227/226)"),
+    (ROWS[6], "Venusaur (promo-a)"),
+    ((1, "Pikachu", "promo-a", None), "Pikachu (promo-a)"),
+])
+def test_label_tells_printings_apart(row, expected):
+    assert card_label(*row[1:]) == expected
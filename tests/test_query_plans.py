@@ -0,0 +1,40 @@
+import sqlite3
+
+import pytest
+
+from utils.check_query_plans import (CARD_MANAGEMENT_PATH, PLANNED_STATEMENTS, collect_statements,
+                                     filter_statements, plan_problems)
+from utils.import_cards import create_card_tables, ensure_search_index
+
+STATEMENTS, UNREADABLE = collect_statements(CARD_MANAGEMENT_PATH)
+PLANNED = [(location, sql) for location, sql in STATEMENTS
+           if sql.strip().upper().startswith(PLANNED_STATEMENTS)]
+FILTERS = filter_statements()
+
+
+@pytest.fixture(scope="module")
+def conn():
+    """An empty database with the schema the importer creates"""
+    conn = sqlite3.connect(":memory:")
+    create_card_tables(conn)
+    ensure_search_index(conn)
+    yield conn
+    conn.close()
+
+
+def test_every_statement_can_be_read():
+    assert UNREADABLE == []
+    assert PLANNED
+
+
+@pytest.mark.parametrize("location, sql", PLANNED, ids=[location for location, _ in PLANNED])
+def test_statement_does_not_scan(conn, location, sql):
+    plan, problems = plan_problems(conn, sql)
+    assert problems == [], f"{location} plans {plan}"
+
+
+@pytest.mark.parametrize("location, sql", FILTERS, ids=[location for location, _ in FILTERS])
+def test_filter_combination_searches_an_index(conn, location, sql):
+    plan, problems = plan_problems(conn, sql)
+    assert problems == [], f"{location} plans {plan}"
+    assert any(line.startswith("SEARCH ") for line in plan), f"{location} plans {plan}"
@@ -0,0 +1,93 @@
+import json
+import os
+import sqlite3
+
+import pytest
+from PIL import Image
+
+from utils.import_cards import import_cards_from_json
+from utils.thumbnail_store import ThumbnailStore, build_thumbnail_store
+
+COLOURS = {"Bulbasaur": (0, 160, 0), "Dubwool": (200, 200, 200), "Charmander": (220, 60, 0)}
+
+
+def card(set_number, name, image_path):
+    return {"set_name": "geneticapex", "set_number": set_number, "name": name, "local_image_path": image_path}
+
+
+@pytest.fixture
+def cards(tmp_path):
+    """The cards, each with its own single-colour image"""
+    result = []
+    for set_number, name in enumerate(COLOURS, 1):
+        image_path = str(tmp_path / f"{name}.png")
+        Image.new("RGB", (60, 84), COLOURS[name]).save(image_path)
+        result.append(card(str(set_number), name, image_path))
+    return result
+
+
+def import_cards(tmp_path, db_path, cards, force_recreate=False):
+    json_file = tmp_path / "cards.json"
+    json_file.write_text(json.dumps(cards))
+    import_cards_from_json(str(json_file), db_path, force_recreate)
+
+
+def stored_colours(store, db_path, target_size=(64, 128)):
+    """Map each card's name to the colour of the thumbnail the store serves for it"""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT name, image_path FROM cards").fetchall()
+    conn.close()
+    colours = {}
+    for name, image_path in rows:
+        variant = store.variant_for(image_path, target_size)
+        colours[name] = None if variant is None else store.image(variant).getpixel((0, 0))
+    return colours
+
+
+def test_variant_fits_the_target_size(tmp_path, cards):
+    db_path = str(tmp_path / "cards.db")
+    import_cards(tmp_path, db_path, cards)
+    build_thumbnail_store(db_path, str(tmp_path / "thumbs.bin"), widths=(20, 40, 60))
+    store = ThumbnailStore(str(tmp_path / "thumbs.bin"))
+    image_path = cards[0]["local_image_path"]
+
+    assert store.variant_for(image_path, (45, 100))[:2] == [40, 56]
+    # Smaller than every variant: the smallest is still served
+    assert store.variant_for(image_path, (10, 10))[:2] == [20, 28]
+    assert store.variant_for(str(tmp_path / "missing.png"), (45, 100)) is None
+    store.close()
+
+
+def test_thumbnails_follow_the_image_when_card_ids_change(tmp_path, cards):
+    db_path = str(tmp_path / "cards.db")
+    import_cards(tmp_path, db_path, cards)
+    build_thumbnail_store(db_path, str(tmp_path / "thumbs.bin"))
+
+    # A forced re-import in another order gives every card a new id
+    import_cards(tmp_path, db_path, cards[::-1], force_recreate=True)
+    store = ThumbnailStore(str(tmp_path / "thumbs.bin"))
+    assert stored_colours(store, db_path) == COLOURS
+    store.close()
+
+
+def test_changed_image_with_the_same_mtime_is_stale(tmp_path, cards):
+    db_path = str(tmp_path / "cards.db")
+    import_cards(tmp_path, db_path, cards)
+    build_thumbnail_store(db_path, str(tmp_path / "thumbs.bin"))
+    store = ThumbnailStore(str(tmp_path / "thumbs.bin"))
+
+    # As after a checkout, which gives every file the same mtime
+    image_path = cards[0]["local_image_path"]
+    stat = os.stat(image_path)
+    Image.new("RGB", (120, 168), (0, 0, 200)).save(image_path)
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert store.variant_for(image_path, (64, 128)) is None
+    assert store.variant_for(cards[1]["local_image_path"], (64, 128)) is not None
+    store.close()
+
+
+def test_open_ignores_a_missing_or_foreign_file(tmp_path):
+    assert ThumbnailStore.open(str(tmp_path / "missing.bin")) is None
+    (tmp_path / "other.bin").write_bytes(b"PTCGTHM1" + bytes(16))
+    assert ThumbnailStore.open(str(tmp_path / "other.bin")) is None